@@ -1,5 +1,6 @@
 @echo off
 cd /d C:\Users\josep\dpl
 call venv\Scripts\activate
+start "" /b python manage.py run_report_worker
 start "" http://127.0.0.1:8000
-waitress-serve --listen=127.0.0.1:8000 dpl_core.wsgi:application
\ No newline at end of file
+uvicorn --host 127.0.0.1 --port 8000 --workers 1 dpl_core.asgi:application
\ No newline at end of file
@@ -23,13 +23,23 @@ if not os.path.exists(venv_python):
 
 port = find_free_port()
 
-# Start waitress using venv python
+# Start uvicorn using venv python. The live change feed (/events/) needs an
+# ASGI server and, since its broker is in memory, a single process.
 process = subprocess.Popen([
     venv_python,
     "-m",
-    "waitress",
-    "--listen=127.0.0.1:" + str(port),
-    "dpl_core.wsgi:application"
+    "uvicorn",
+    "--host=127.0.0.1",
+    "--port=" + str(port),
+    "--workers=1",
+    "dpl_core.asgi:application"
+], cwd=BASE_DIR)
+
+# Report exports run in their own process, not in the web server.
+report_worker = subprocess.Popen([
+    venv_python,
+    "manage.py",
+    "run_report_worker"
 ], cwd=BASE_DIR)
 
 # Wait for server to start
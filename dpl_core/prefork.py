@@ -0,0 +1,401 @@
+"""
+Pre-forking HTTP server for dpl_core.wsgi:application (Linux and other Unix
+systems; use waitress on Windows).
+
+The master process loads Django and the WSGI application once, binds the
+listening socket and forks worker processes that share it. Each worker runs
+waitress on that socket with a fixed pool of threads, so CPU-bound work such
+as template rendering runs on every core instead of behind a single GIL.
+Workers share the file-based cache in settings.CACHES, so cached sessions,
+users and pages are seen by all of them.
+
+Signals understood by the master:
+
+    TERM, INT   graceful shutdown; workers finish their in-flight requests
+    QUIT        immediate shutdown
+    HUP         zero-downtime reload: a new master is started from the code on
+                disk, on the same socket. Once its workers are up it retires
+                the old master, whose workers drain their requests first. If
+                the new code fails its health check, the old master keeps
+                serving.
+    TTIN, TTOU  add or remove one worker
+
+Workers report liveness through a heartbeat file; a worker that misses it for
+`timeout` seconds is killed and replaced.
+
+The live change feed (projects.events) needs an ASGI server and is not
+available here: /events/ answers 204. Its broker only reaches subscribers in
+the same process, so the feed would in any case only work with one worker.
+Serve dpl_core.asgi with a single uvicorn process when it is wanted.
+"""
+
+import gc
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+LISTEN_FD_ENV = 'DPL_LISTEN_FD'
+REPLACES_PID_ENV = 'DPL_REPLACES_PID'
+HEALTH_CHECK_PATH = '/healthz/'
+
+
+def create_listener(host, port, backlog=2048):
+    """Binds the listening socket, or adopts the one handed over by a reload."""
+    fd = os.environ.pop(LISTEN_FD_ENV, None)
+    if fd is not None:
+        return socket.socket(fileno=int(fd))
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+
+def check_application(app, path=HEALTH_CHECK_PATH):
+    """Runs one request through `app` in-process; raises unless it answers 200."""
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET'}
+    setup_testing_defaults(environ)
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = status
+        return lambda data: None
+
+    body = app(environ, start_response)
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    if not response.get('status', '').startswith('200'):
+        raise RuntimeError(f"{path} answered {response.get('status')!r}")
+
+
+def access_log_middleware(app):
+    """Logs one line per request; waitress itself doesn't write an access log."""
+    def logged(environ, start_response):
+        def start(status, headers, exc_info=None):
+            logger.info(
+                '%s "%s %s" %s', environ.get('REMOTE_ADDR', '-'), environ.get('REQUEST_METHOD'),
+                environ.get('PATH_INFO', ''), status.split(' ', 1)[0],
+            )
+            return start_response(status, headers, exc_info)
+        return app(environ, start)
+    return logged
+
+
+def create_worker_server(app, sock, threads, keepalive=5, backlog=2048, access_log=False):
+    """A waitress server on the inherited listening socket."""
+    from waitress.server import create_server
+
+    if access_log:
+        app = access_log_middleware(app)
+    # Several workers wait on the same socket; waitress accepts without
+    # blocking, so the ones that lose the race for a connection move on.
+    return create_server(
+        app, sockets=[sock], threads=threads, channel_timeout=keepalive, backlog=backlog,
+    )
+
+
+def in_flight(server):
+    return any(channel.requests for channel in list(server.active_channels.values()))
+
+
+class Worker:
+    def __init__(self, age):
+        self.age = age
+        self.pid = None
+        self.spawned_at = time.time()
+        self.stopping_since = None
+        # Unlinked file whose mtime the worker bumps; 0 until it is serving.
+        self.heartbeat = tempfile.TemporaryFile(prefix='dpl-worker-')
+        os.utime(self.heartbeat.fileno(), (0, 0))
+        self.alive = True
+
+    def last_beat(self):
+        return os.fstat(self.heartbeat.fileno()).st_mtime
+
+    @property
+    def booted(self):
+        return self.last_beat() > 0
+
+    def notify(self):
+        os.utime(self.heartbeat.fileno())
+
+    def init_signals(self):
+        def stop(signum, frame):
+            self.alive = False
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGQUIT, lambda signum, frame: os._exit(0))
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        for signum in (signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(signum, signal.SIG_IGN)
+
+    def run(self, app, sock, threads, keepalive, backlog, access_log, timeout, graceful_timeout, exit_hooks=()):
+        """Worker process main loop; never returns."""
+        master_pid = os.getppid()
+        random.seed()
+
+        server = create_worker_server(app, sock, threads, keepalive=keepalive, backlog=backlog, access_log=access_log)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+
+        interval = min(1.0, timeout / 4)
+        while self.alive and os.getppid() == master_pid and thread.is_alive():
+            self.notify()
+            time.sleep(interval)
+
+        # Stop accepting, then let in-flight requests finish; the master kills
+        # workers that take longer than graceful_timeout.
+        server.accepting = False
+        server.pull_trigger()
+        deadline = time.monotonic() + graceful_timeout
+        while thread.is_alive() and in_flight(server) and time.monotonic() < deadline:
+            self.notify()
+            time.sleep(0.1)
+        server.task_dispatcher.shutdown(timeout=max(0, deadline - time.monotonic()))
+        # Background work started by requests (e.g. report jobs) would be
+        # lost at _exit; the hooks get what is left of graceful_timeout to
+        # finish or hand it back before the master kills the worker.
+        for hook in exit_hooks:
+            try:
+                hook(timeout=max(0, deadline - time.monotonic() - 1))
+            except Exception:
+                logger.exception("Worker exit hook %r failed", hook)
+        os._exit(0)
+
+
+class Arbiter:
+    def __init__(self, app, sock, workers, threads=4, timeout=30, graceful_timeout=30,
+                 keepalive=5, backlog=2048, access_log=False, pidfile=None, worker_exit_hooks=()):
+        self.app = app
+        self.sock = sock
+        self.num_workers = workers
+        self.threads = threads
+        self.timeout = timeout
+        self.graceful_timeout = graceful_timeout
+        self.keepalive = keepalive
+        self.backlog = backlog
+        self.access_log = access_log
+        self.pidfile = pidfile
+        self.worker_exit_hooks = list(worker_exit_hooks)
+        self.workers = {}
+        self.worker_age = 0
+        self.reexec_pid = None
+        self.replaces_pid = None
+        self._signals = []
+        self._wakeup_r = self._wakeup_w = None
+
+    # Signals are queued and handled from the main loop.
+
+    def _init_signals(self):
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGQUIT, signal.SIGHUP,
+                       signal.SIGTTIN, signal.SIGTTOU, signal.SIGCHLD):
+            signal.signal(signum, self._queue_signal)
+
+    def _queue_signal(self, signum, frame):
+        if signum != signal.SIGCHLD and len(self._signals) < 5:
+            self._signals.append(signum)
+        try:
+            os.write(self._wakeup_w, b'.')
+        except BlockingIOError:
+            pass
+
+    def _sleep(self):
+        try:
+            ready, _, _ = select.select([self._wakeup_r], [], [], 1.0)
+            if ready:
+                while os.read(self._wakeup_r, 64):
+                    pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def run(self):
+        self.pid = os.getpid()
+        replaces = os.environ.pop(REPLACES_PID_ENV, None)
+        self.replaces_pid = int(replaces) if replaces else None
+        self._init_signals()
+        if self.replaces_pid is None:
+            self._write_pidfile()
+        host, port = self.sock.getsockname()[:2]
+        logger.info(
+            "Serving on http://%s:%s (master %s, %s workers x %s threads)",
+            host, port, self.pid, self.num_workers, self.threads,
+        )
+        # Objects loaded so far stay shared with the workers instead of
+        # being copied on the first garbage collection in each of them.
+        gc.freeze()
+        try:
+            while True:
+                self._reap_workers()
+                if self._signals:
+                    signum = self._signals.pop(0)
+                    if signum in (signal.SIGTERM, signal.SIGINT):
+                        self.stop(graceful=True)
+                        return
+                    if signum == signal.SIGQUIT:
+                        self.stop(graceful=False)
+                        return
+                    if signum == signal.SIGHUP:
+                        self.reload()
+                    elif signum == signal.SIGTTIN:
+                        self.num_workers += 1
+                    elif signum == signal.SIGTTOU:
+                        self.num_workers = max(1, self.num_workers - 1)
+                self._murder_stale_workers()
+                self._manage_workers()
+                self._retire_replaced_master()
+                self._sleep()
+        finally:
+            self._remove_pidfile()
+
+    def _spawn_worker(self):
+        self.worker_age += 1
+        worker = Worker(self.worker_age)
+        connections.close_all()
+        pid = os.fork()
+        if pid:
+            worker.pid = pid
+            self.workers[pid] = worker
+            return
+        # Child: drop the master's state and serve until told to stop.
+        try:
+            worker.init_signals()
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            for other in self.workers.values():
+                other.heartbeat.close()
+            worker.run(
+                self.app, self.sock, self.threads, self.keepalive, self.backlog, self.access_log,
+                self.timeout, self.graceful_timeout, self.worker_exit_hooks,
+            )
+        except BaseException:
+            logger.exception("Worker %s crashed", os.getpid())
+        finally:
+            os._exit(1)
+
+    def _manage_workers(self):
+        running = [w for w in self.workers.values() if w.stopping_since is None]
+        for _ in range(self.num_workers - len(running)):
+            self._spawn_worker()
+        for worker in sorted(running, key=lambda w: w.age)[:max(0, len(running) - self.num_workers)]:
+            self._stop_worker(worker, signal.SIGTERM)
+
+    def _stop_worker(self, worker, signum):
+        if worker.stopping_since is None:
+            worker.stopping_since = time.time()
+        try:
+            os.kill(worker.pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _reap_workers(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            code = os.waitstatus_to_exitcode(status)
+            if pid == self.reexec_pid:
+                self.reexec_pid = None
+                logger.error("Reload failed (new master exited with %s); still serving the old code.", code)
+                continue
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            worker.heartbeat.close()
+            if worker.stopping_since is None:
+                logger.warning("Worker %s exited unexpectedly (%s); replacing it.", pid, code)
+
+    def _murder_stale_workers(self):
+        now = time.time()
+        for worker in list(self.workers.values()):
+            if worker.stopping_since is not None:
+                if now - worker.stopping_since > self.graceful_timeout:
+                    self._stop_worker(worker, signal.SIGKILL)
+                continue
+            last_beat = worker.last_beat() or worker.spawned_at
+            if now - last_beat > self.timeout:
+                logger.error("Worker %s missed its heartbeat for %ss; killing it.", worker.pid, self.timeout)
+                self._stop_worker(worker, signal.SIGKILL)
+
+    def _retire_replaced_master(self):
+        """After a reload, stop the previous master once all new workers serve."""
+        if self.replaces_pid is None:
+            return
+        if len(self.workers) < self.num_workers or not all(w.booted for w in self.workers.values()):
+            return
+        logger.info("Workers ready; retiring previous master %s.", self.replaces_pid)
+        try:
+            os.kill(self.replaces_pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        self.replaces_pid = None
+        self._write_pidfile()
+
+    def reload(self):
+        if self.reexec_pid is not None:
+            logger.warning("A reload is already in progress.")
+            return
+        logger.info("Reloading: starting a new master from the current code.")
+        self.sock.set_inheritable(True)
+        env = dict(os.environ, **{LISTEN_FD_ENV: str(self.sock.fileno()), REPLACES_PID_ENV: str(self.pid)})
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.execve(sys.executable, sys.orig_argv, env)
+            finally:
+                os._exit(127)
+        self.reexec_pid = pid
+
+    def stop(self, graceful=True):
+        logger.info("Shutting down (%s).", "graceful" if graceful else "immediate")
+        for worker in list(self.workers.values()):
+            self._stop_worker(worker, signal.SIGTERM if graceful else signal.SIGQUIT)
+        deadline = time.time() + (self.graceful_timeout if graceful else 2)
+        while self.workers and time.time() < deadline:
+            self._reap_workers()
+            time.sleep(0.1)
+        for worker in list(self.workers.values()):
+            self._stop_worker(worker, signal.SIGKILL)
+        while self.workers:
+            self._reap_workers()
+            time.sleep(0.05)
+        self.sock.close()
+
+    def _write_pidfile(self):
+        if self.pidfile:
+            with open(self.pidfile, 'w') as f:
+                f.write(f"{self.pid}\n")
+
+    def _remove_pidfile(self):
+        if not self.pidfile:
+            return
+        try:
+            with open(self.pidfile) as f:
+                if f.read().strip() != str(self.pid):
+                    return  # taken over by a newer master
+            os.unlink(self.pidfile)
+        except OSError:
+            pass
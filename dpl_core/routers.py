@@ -0,0 +1,130 @@
+"""
+Database routing for the optional read replica.
+
+Heavy read-only views (reports, exports) run inside ``read_replica()``. While
+that context is active every read is sent to the ``READ_REPLICA_ALIAS``
+connection, provided it is configured, reachable and not older than
+``READ_REPLICA_MAX_STALENESS`` seconds. Otherwise reads fall back to the
+primary database. Writes always go to the primary.
+
+A replica that is missing migrations the running code has is also bypassed,
+whatever its lag, since queries against new tables or columns would fail
+there. Each process checks this once per replica refresh (SQLite file mtime)
+or every MIGRATION_CHECK_INTERVAL seconds for server replicas, not on every
+request, and without querying the primary.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.local import Local
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations.executor import MigrationExecutor
+
+_state = Local()
+
+MIGRATION_CHECK_INTERVAL = 60
+# alias -> (replica marker, whether it had every migration on disk)
+_migration_checks = {}
+
+
+def get_replica_alias():
+    alias = getattr(settings, 'READ_REPLICA_ALIAS', None)
+    if alias and alias in settings.DATABASES:
+        return alias
+    return None
+
+
+def get_replica_path():
+    """Filesystem path of a SQLite replica, or None for server-backed replicas."""
+    path = getattr(settings, 'READ_REPLICA_SQLITE_PATH', None)
+    return str(path) if path else None
+
+
+def replica_lag(alias):
+    """
+    Returns how many seconds behind the primary the replica is, or None when
+    the lag cannot be measured (the replica is then trusted as fresh).
+    Raises DatabaseError/OSError when the replica is unusable.
+    """
+    path = get_replica_path()
+    if path:
+        return time.time() - os.path.getmtime(path)
+
+    connection = connections[alias]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())")
+            row = cursor.fetchone()
+        return float(row[0]) if row and row[0] is not None else None
+
+    connection.ensure_connection()
+    return None
+
+
+def replica_is_migrated(alias):
+    path = get_replica_path()
+    if path:
+        marker = os.path.getmtime(path)
+    else:
+        marker = int(time.monotonic() // MIGRATION_CHECK_INTERVAL)
+    checked = _migration_checks.get(alias)
+    if checked and checked[0] == marker:
+        return checked[1]
+    executor = MigrationExecutor(connections[alias])
+    migrated = not executor.migration_plan(executor.loader.graph.leaf_nodes())
+    _migration_checks[alias] = (marker, migrated)
+    return migrated
+
+
+def get_read_alias():
+    """The alias report queries should use right now."""
+    alias = get_replica_alias()
+    if alias is None:
+        return DEFAULT_DB_ALIAS
+    try:
+        lag = replica_lag(alias)
+        if not replica_is_migrated(alias):
+            return DEFAULT_DB_ALIAS
+    except (DatabaseError, OSError):
+        return DEFAULT_DB_ALIAS
+    max_staleness = getattr(settings, 'READ_REPLICA_MAX_STALENESS', None)
+    if lag is not None and max_staleness is not None and lag > max_staleness:
+        return DEFAULT_DB_ALIAS
+    return alias
+
+
+@contextmanager
+def read_replica():
+    previous = getattr(_state, 'alias', None)
+    _state.alias = get_read_alias()
+    try:
+        yield _state.alias
+    finally:
+        _state.alias = previous
+
+
+def use_read_replica(view_func):
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        with read_replica():
+            return view_func(*args, **kwargs)
+    return wrapper
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return getattr(_state, 'alias', None)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary; never migrate it directly.
+        return db != get_replica_alias()
@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'teams',
     'projects',
     'reports',
     'products',
@@ -48,6 +49,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'teams.middleware.TenantMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -79,10 +81,83 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    # Read-only copy used by reports and exports. The SQLite copy is refreshed
+    # with `python manage.py refresh_replica` (e.g. from cron). To use a real
+    # replica instead, point this at it and set READ_REPLICA_SQLITE_PATH = None.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f"file:{BASE_DIR / 'db.replica.sqlite3'}?mode=ro",
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['dpl_core.routers.ReadReplicaRouter']
+
+READ_REPLICA_ALIAS = 'replica'
+READ_REPLICA_SQLITE_PATH = BASE_DIR / 'db.replica.sqlite3'
+# Reads fall back to 'default' when the replica is older than this (seconds).
+READ_REPLICA_MAX_STALENESS = 15 * 60
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# File-based so every server process sees the same entries. To use a shared
+# cache server, swap the backend, e.g.
+#   'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+#   'LOCATION': 'redis://127.0.0.1:6379',
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
     }
 }
 
 
+# Sessions & authentication
+# Sessions are read from the cache and only fall back to the database on a
+# miss; the signed-in user is cached too (see dpl_core.auth). Expired rows are
+# removed by `python manage.py cleanup_sessions` (run it from cron).
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Sessions record the backend that logged them in; ModelBackend stays listed
+# so sessions started before the cached backend was added remain valid.
+AUTHENTICATION_BACKENDS = [
+    'dpl_core.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+AUTH_USER_CACHE_TIMEOUT = 5 * 60
+
+# The active organization is picked per session; the user's memberships are
+# cached as well (see teams.tenancy).
+MEMBERSHIP_CACHE_TIMEOUT = 5 * 60
+
+
+# Report exports
+# PDF/Excel reports are generated in the background and stored here, named by
+# a hash of their input data so unchanged reports are served from disk.
+# Jobs are run by `python manage.py run_report_worker`, a separate process, so
+# large exports never tie up a web worker. For a single-process setup without
+# it, set REPORT_WORKER_THREADS to run them on that many threads in the web
+# process instead. Jobs still queued or running after REPORT_JOB_STALE_AFTER
+# seconds (e.g. after a crash) are queued again.
+
+REPORTS_ROOT = BASE_DIR / 'generated_reports'
+REPORT_WORKER_THREADS = 0
+REPORT_JOB_STALE_AFTER = 30 * 60
+
+# "At risk" flags on the reports dashboard and the project list come from the
+# forecast table, rebuilt by `python manage.py forecast_projects` (run it
+# nightly from cron; it needs numpy).
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -23,4 +23,5 @@ urlpatterns = [
     path('', include('projects.urls')),
     path('reports/', include('reports.urls')),
     path('products/', include('products.urls')),
+    path('teams/', include('teams.urls')),
 ]
\ No newline at end of file
@@ -0,0 +1,48 @@
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, F, Value
+
+FACET_CACHE_TIMEOUT = 60 * 60
+
+
+def _version_key(organization_id):
+    return f"product-facets:{organization_id}:version"
+
+
+def invalidate_facets(organization_id):
+    cache.set(_version_key(organization_id), time.time_ns(), None)
+
+
+def compute_facets(queryset):
+    """
+    Counts products per technology and per project with a single grouped
+    UNION query. Returns (technology_facets, project_facets).
+    """
+    technologies = queryset.filter(technologies__isnull=False).order_by().values(
+        facet=Value('technology'), value=F('technologies__id'), label=F('technologies__name'),
+    ).annotate(count=Count('pk', distinct=True))
+    projects = queryset.filter(project__isnull=False).order_by().values(
+        facet=Value('project'), value=F('project_id'), label=F('project__name'),
+    ).annotate(count=Count('pk', distinct=True))
+
+    facets = {'technology': [], 'project': []}
+    for row in technologies.union(projects, all=True):
+        facets[row['facet']].append(row)
+    for rows in facets.values():
+        rows.sort(key=lambda row: (-row['count'], row['label'].lower()))
+    return facets['technology'], facets['project']
+
+
+def get_facets(organization, queryset, *filters):
+    """
+    Facet counts for `queryset`, cached per organization and per active filter
+    combination until a product changes or a project is renamed or deleted.
+    """
+    version = cache.get_or_set(_version_key(organization.pk), time.time_ns, None)
+    key = f"product-facets:{organization.pk}:{version}:" + ':'.join(str(value or '') for value in filters)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
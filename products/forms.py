@@ -0,0 +1,24 @@
+from django import forms
+
+from projects.models import Project
+from .models import Product
+
+
+class ProductForm(forms.ModelForm):
+    tech_stack = forms.CharField(max_length=255, required=False)
+
+    class Meta:
+        model = Product
+        fields = ['name', 'link', 'description', 'creation_date', 'version', 'project']
+
+    def __init__(self, *args, organization=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['project'].queryset = Project.objects.for_tenant(organization).order_by('name')
+        if self.instance.pk:
+            self.fields['tech_stack'].initial = self.instance.tech_stack
+
+    def save(self, commit=True):
+        product = super().save(commit)
+        if commit:
+            product.set_tech_stack(self.cleaned_data['tech_stack'])
+        return product
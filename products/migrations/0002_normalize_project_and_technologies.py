@@ -0,0 +1,100 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:42
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def parse_tech_stack(value):
+    if not value:
+        return []
+    separator = ',' if ',' in value else r'\s+'
+    names = {}
+    for part in re.split(separator, value):
+        name = part.strip()
+        if name:
+            names.setdefault(name.lower(), name[:100])
+    return list(names.values())
+
+
+def normalize_products(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    Project = apps.get_model('projects', 'Project')
+    Technology = apps.get_model('products', 'Technology')
+    Through = Product.technologies.through
+
+    technologies = {}
+    for product in Product.objects.all().iterator():
+        ref = (product.project_ref or '').strip()
+        if ref:
+            projects = Project.objects.filter(owner_id=product.owner_id).order_by('pk')
+            project = projects.filter(pk=int(ref)).first() if ref.isdigit() else None
+            project = project or projects.filter(name__iexact=ref).first()
+            if project is not None:
+                # Matched references move to the FK; unmatched ones stay as text.
+                Product.objects.filter(pk=product.pk).update(project=project, project_ref=None)
+
+        for name in parse_tech_stack(product.tech_stack):
+            key = name.lower()
+            if key not in technologies:
+                technologies[key], _ = Technology.objects.get_or_create(key=key, defaults={'name': name})
+            Through.objects.get_or_create(product_id=product.pk, technology_id=technologies[key].pk)
+
+
+def denormalize_products(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    for product in Product.objects.select_related('project').prefetch_related('technologies').iterator(chunk_size=500):
+        Product.objects.filter(pk=product.pk).update(
+            project_ref=product.project.name if product.project else product.project_ref,
+            tech_stack=', '.join(tech.name for tech in product.technologies.all()) or None,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('projects', '0003_calendarfeed_reminder_updated_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Technology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'technologies',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='project',
+            field=models.ForeignKey(blank=True, help_text='The project that birthed this product', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to='projects.project'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='technologies',
+            field=models.ManyToManyField(blank=True, related_name='products', to='products.technology'),
+        ),
+        migrations.RunPython(normalize_products, denormalize_products),
+        migrations.RemoveField(
+            model_name='product',
+            name='tech_stack',
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='project_ref',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['owner', 'project'], name='products_pr_owner_i_889b20_idx'),
+        ),
+    ]
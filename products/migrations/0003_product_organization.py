@@ -0,0 +1,54 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_personal_organizations(apps, schema_editor):
+    """Existing products move into their owner's personal organization."""
+    Membership = apps.get_model('teams', 'Membership')
+    Product = apps.get_model('products', 'Product')
+
+    personal = {}
+    for user_id, organization_id in Membership.objects.filter(role='OWNER').order_by(
+        '-created_at', '-pk'
+    ).values_list('user_id', 'organization_id'):
+        personal[user_id] = organization_id  # oldest owned organization wins
+    owner_ids = Product.objects.filter(organization__isnull=True).values_list('owner_id', flat=True).distinct()
+    for owner_id in list(owner_ids):
+        Product.objects.filter(owner_id=owner_id, organization__isnull=True).update(
+            organization_id=personal[owner_id]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_normalize_project_and_technologies'),
+        ('projects', '0004_project_organization'),
+        ('teams', '0002_personal_organizations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='organization',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='products', to='teams.organization'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['organization', 'creation_date'], name='products_pr_organiz_38364a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['organization', 'project'], name='products_pr_organiz_51bc91_idx'),
+        ),
+        migrations.RunPython(assign_personal_organizations, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='product',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='products', to='teams.organization'),
+        ),
+    ]
@@ -1,8 +1,54 @@
+import re
+
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from projects.models import Project
+from teams.models import Organization, TenantManager
+
+def parse_tech_stack(value):
+    """
+    Splits a free-text stack ("Django, React Native" or "Django React") into
+    unique technology names, keeping the order they were written in.
+    """
+    if not value:
+        return []
+    separator = ',' if ',' in value else r'\s+'
+    names = {}
+    for part in re.split(separator, value):
+        name = part.strip()
+        if name:
+            names.setdefault(name.lower(), name[:100])
+    return list(names.values())
+
+class Technology(models.Model):
+    name = models.CharField(max_length=100)
+    # Lower-cased name, so "django" and "Django" share one tag.
+    key = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = 'technologies'
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def resolve(cls, names):
+        """Returns {key: Technology} for `names`, creating missing tags in bulk."""
+        wanted = {name.lower(): name for name in names}
+        if not wanted:
+            return {}
+        existing = {tech.key: tech for tech in cls.objects.filter(key__in=wanted)}
+        missing = [cls(name=name, key=key) for key, name in wanted.items() if key not in existing]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            existing = {tech.key: tech for tech in cls.objects.filter(key__in=wanted)}
+        return existing
+
 class Product(models.Model):
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='products')
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='products')
     name = models.CharField(max_length=255)
     link = models.URLField(max_length=500, blank=True, null=True)
@@ -11,14 +57,34 @@ class Product(models.Model):
     version = models.CharField(max_length=50, blank=True, null=True)
     
     # Traceability fields
-    project_ref = models.CharField(max_length=255, blank=True, null=True, help_text="Reference to the project that birthed this product")
-    tech_stack = models.CharField(max_length=255, blank=True, null=True)
+    project = models.ForeignKey(
+        Project, on_delete=models.SET_NULL, blank=True, null=True, related_name='products',
+        help_text="The project that birthed this product",
+    )
+    # Free-text references from before `project` existed that matched no project.
+    project_ref = models.CharField(max_length=255, blank=True, null=True, editable=False)
+    technologies = models.ManyToManyField(Technology, blank=True, related_name='products')
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         ordering = ['-creation_date']
+        indexes = [
+            models.Index(fields=['owner', 'project']),
+            models.Index(fields=['organization', 'creation_date']),
+            models.Index(fields=['organization', 'project']),
+        ]
 
     def __str__(self):
         return self.name
+
+    @property
+    def tech_stack(self):
+        return ', '.join(tech.name for tech in self.technologies.all())
+
+    def set_tech_stack(self, value):
+        technologies = Technology.resolve(parse_tech_stack(value))
+        self.technologies.set(technologies.values())
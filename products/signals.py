@@ -0,0 +1,31 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from projects.models import Project
+from .facets import invalidate_facets
+from .models import Product
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Project)
+def tenant_data_changed(sender, instance, **kwargs):
+    invalidate_facets(instance.organization_id)
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    # Projects are saved on every task change (progress); only a rename or a
+    # move shows up in the facets.
+    if instance.facets_changed:
+        loaded = getattr(instance, '_loaded_facet_state', None)
+        if loaded:
+            invalidate_facets(loaded[0])
+        invalidate_facets(instance.organization_id)
+    instance._loaded_facet_state = instance.facet_state()
+
+
+@receiver(m2m_changed, sender=Product.technologies.through)
+def product_technologies_changed(sender, instance, action, **kwargs):
+    if action.startswith('post_') and isinstance(instance, Product):
+        invalidate_facets(instance.organization_id)
@@ -1,3 +1,74 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from projects.models import Project
+from teams.models import Membership
+from teams.tenancy import TENANT_SESSION_KEY
+from .models import Product
+
+
+class ProductTenancyTests(TestCase):
+    def setUp(self):
+        # Cached memberships and facets are keyed by ids, which tests reuse.
+        cache.clear()
+        self.member = User.objects.create_user('member', password='pw')
+        self.organization = self.member.organizations.get()
+        self.product = Product.objects.create(
+            organization=self.organization, owner=self.member, name='Our product', description='Ours',
+        )
+
+        outsider = User.objects.create_user('outsider', password='pw')
+        outsider_organization = outsider.organizations.get()
+        self.foreign_project = Project.objects.create(
+            organization=outsider_organization, owner=outsider, name='Their project', deadline=date(2026, 6, 1),
+        )
+        self.foreign_product = Product.objects.create(
+            organization=outsider_organization, owner=outsider, name='Their product', description='Theirs',
+        )
+
+        self.client.force_login(self.member)
+
+    def test_other_organizations_products_are_not_found(self):
+        for name in ['product_detail', 'product_update', 'product_delete']:
+            with self.subTest(name):
+                self.assertEqual(self.client.get(reverse(name, args=[self.product.pk])).status_code, 200)
+                self.assertEqual(self.client.get(reverse(name, args=[self.foreign_product.pk])).status_code, 404)
+
+        self.assertEqual(self.client.post(reverse('product_delete', args=[self.foreign_product.pk])).status_code, 404)
+        self.assertTrue(Product.objects.filter(pk=self.foreign_product.pk).exists())
+
+    def test_list_only_shows_the_active_organization(self):
+        response = self.client.get(reverse('product_list'))
+        self.assertContains(response, 'Our product')
+        self.assertNotContains(response, 'Their product')
+
+    def test_cannot_link_another_organizations_project(self):
+        response = self.client.post(reverse('product_create'), {
+            'name': 'Sneaky', 'description': 'x', 'creation_date': '2026-01-01', 'project': self.foreign_project.pk,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('project', response.context['form'].errors)
+        self.assertFalse(Product.objects.filter(name='Sneaky').exists())
+
+    def test_viewer_can_read_but_not_edit(self):
+        viewer = User.objects.create_user('viewer', password='pw')
+        Membership.objects.create(organization=self.organization, user=viewer, role='VIEWER')
+        self.client.force_login(viewer)
+        session = self.client.session
+        session[TENANT_SESSION_KEY] = self.organization.pk
+        session.save()
 
-# Create your tests here.
+        self.assertEqual(self.client.get(reverse('product_detail', args=[self.product.pk])).status_code, 200)
+        for url in [
+            reverse('product_create'),
+            reverse('product_update', args=[self.product.pk]),
+            reverse('product_delete', args=[self.product.pk]),
+        ]:
+            with self.subTest(url):
+                self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.post(reverse('product_delete', args=[self.product.pk])).status_code, 403)
+        self.assertTrue(Product.objects.filter(pk=self.product.pk).exists())
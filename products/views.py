@@ -1,55 +1,92 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
 from django.urls import reverse_lazy
 from .models import Product
+from .forms import ProductForm
+from .facets import get_facets
+from teams.mixins import TenantRequiredMixin, TenantEditRequiredMixin
 
-class ProductListView(LoginRequiredMixin, ListView):
+class ProductListView(TenantRequiredMixin, ListView):
     model = Product
     template_name = 'products/product_list.html'
     context_object_name = 'products'
 
     def get_queryset(self):
-        return Product.objects.filter(owner=self.request.user)
+        queryset = Product.objects.for_tenant(self.request.tenant)
+        self.selected_tech = self.request.GET.get('tech', '')
+        self.selected_project = self.request.GET.get('project', '')
+        if self.selected_tech.isdigit():
+            # Subquery rather than a join, so the technology facet still
+            # counts the other tags of the matching products.
+            tagged = Product.technologies.through.objects.filter(technology_id=self.selected_tech)
+            queryset = queryset.filter(pk__in=tagged.values('product_id'))
+        else:
+            self.selected_tech = ''
+        if self.selected_project.isdigit():
+            queryset = queryset.filter(project_id=self.selected_project)
+        else:
+            self.selected_project = ''
+        self.filtered_queryset = queryset
+        return queryset.select_related('project').prefetch_related('technologies')
 
-class ProductDetailView(LoginRequiredMixin, DetailView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['technology_facets'], context['project_facets'] = get_facets(
+            self.request.tenant, self.filtered_queryset, self.selected_tech, self.selected_project
+        )
+        context['selected_tech'] = self.selected_tech
+        context['selected_project'] = self.selected_project
+        return context
+
+class ProductDetailView(TenantRequiredMixin, DetailView):
     model = Product
     template_name = 'products/product_detail.html'
     context_object_name = 'product'
 
     def get_queryset(self):
-        return Product.objects.filter(owner=self.request.user)
+        return Product.objects.for_tenant(self.request.tenant).select_related('project').prefetch_related('technologies')
 
-class ProductCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
+class ProductCreateView(TenantEditRequiredMixin, SuccessMessageMixin, CreateView):
     model = Product
-    fields = ['name', 'link', 'description', 'creation_date', 'version', 'project_ref', 'tech_stack']
+    form_class = ProductForm
     template_name = 'products/product_form.html'
     success_url = reverse_lazy('product_list')
     success_message = "Product '%(name)s' was recorded successfully."
 
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['organization'] = self.request.tenant
+        return kwargs
+
     def form_valid(self, form):
+        form.instance.organization = self.request.tenant
         form.instance.owner = self.request.user
         return super().form_valid(form)
 
-class ProductUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
+class ProductUpdateView(TenantEditRequiredMixin, SuccessMessageMixin, UpdateView):
     model = Product
-    fields = ['name', 'link', 'description', 'creation_date', 'version', 'project_ref', 'tech_stack']
+    form_class = ProductForm
     template_name = 'products/product_form.html'
     success_url = reverse_lazy('product_list')
     success_message = "Product '%(name)s' was updated successfully."
 
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['organization'] = self.request.tenant
+        return kwargs
+
     def get_queryset(self):
-        return Product.objects.filter(owner=self.request.user)
+        return Product.objects.for_tenant(self.request.tenant)
 
-class ProductDeleteView(LoginRequiredMixin, DeleteView):
+class ProductDeleteView(TenantEditRequiredMixin, DeleteView):
     model = Product
     template_name = 'products/product_confirm_delete.html'
     success_url = reverse_lazy('product_list')
 
     def get_queryset(self):
-        return Product.objects.filter(owner=self.request.user)
+        return Product.objects.for_tenant(self.request.tenant)
 
     def delete(self, request, *args, **kwargs):
         obj = self.get_object()
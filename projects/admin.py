@@ -1,18 +1,25 @@
 from django.contrib import admin
-from .models import Project, Task, Reminder
+from .models import Project, Task, TaskDependency, Reminder, CalendarFeed
 
 class TaskInline(admin.TabularInline):
     model = Task
     extra = 1
 
+class TaskDependencyInline(admin.TabularInline):
+    model = TaskDependency
+    fk_name = 'task'
+    exclude = ('project',)
+    raw_id_fields = ('depends_on',)
+    extra = 1
+
 class ReminderInline(admin.TabularInline):
     model = Reminder
     extra = 1
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
-    list_display = ('name', 'owner', 'client', 'status', 'progress_display', 'deadline', 'is_overdue_display')
-    list_filter = ('status', 'owner')
+    list_display = ('name', 'organization', 'owner', 'client', 'status', 'progress_display', 'deadline', 'is_overdue_display')
+    list_filter = ('status', 'organization', 'owner')
     search_fields = ('name', 'client', 'description')
     inlines = [TaskInline, ReminderInline]
     
@@ -27,11 +34,17 @@ class ProjectAdmin(admin.ModelAdmin):
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
-    list_display = ('title', 'project', 'status', 'due_date')
+    list_display = ('title', 'project', 'status', 'due_date', 'duration_days')
     list_filter = ('status', 'project__owner')
     search_fields = ('title', 'project__name')
+    inlines = [TaskDependencyInline]
 
 @admin.register(Reminder)
 class ReminderAdmin(admin.ModelAdmin):
     list_display = ('project', 'reminder_date', 'is_sent')
     list_filter = ('is_sent', 'project__owner')
+
+@admin.register(CalendarFeed)
+class CalendarFeedAdmin(admin.ModelAdmin):
+    list_display = ('owner', 'created_at')
+    readonly_fields = ('token',)
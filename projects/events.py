@@ -0,0 +1,74 @@
+"""
+In-process pub/sub for the live change feed.
+
+Model signals publish small JSON-serialisable dicts per organization; each open
+server-sent events connection subscribes with its own bounded asyncio queue.
+Publishing is thread-safe, so sync views (run in worker threads under ASGI)
+can publish to subscribers living on the event loop.
+
+The broker only reaches clients connected to the same process, so run a
+single ASGI worker when the live feed matters.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+
+MAX_QUEUE_SIZE = 100
+
+
+class Subscription:
+    def __init__(self, loop, max_queue_size=MAX_QUEUE_SIZE):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+
+    def deliver(self, event):
+        # Runs on the subscriber's loop. A client that stopped reading just
+        # misses events instead of growing the queue without bound.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+
+class EventBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def is_active(self):
+        return bool(self._subscribers)
+
+    def tenant_ids(self):
+        with self._lock:
+            return list(self._subscribers)
+
+    def has_subscribers(self, tenant_id):
+        return bool(self._subscribers.get(tenant_id))
+
+    def subscribe(self, tenant_id):
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[tenant_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, tenant_id, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(tenant_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[tenant_id]
+
+    def publish(self, tenant_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(tenant_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has already shut down.
+                self.unsubscribe(tenant_id, subscription)
+
+
+broker = EventBroker()
@@ -0,0 +1,51 @@
+from django import forms
+
+from .importers import IMPORT_FORMATS, IMPORT_KINDS
+from .models import Task
+from .schedule import find_cycle, set_dependencies
+
+
+class ImportForm(forms.Form):
+    kind = forms.ChoiceField(choices=[(kind, kind.title()) for kind in IMPORT_KINDS])
+    format = forms.ChoiceField(
+        choices=[('', 'Detect from file name')] + [(fmt, fmt.upper()) for fmt in IMPORT_FORMATS],
+        required=False,
+    )
+    file = forms.FileField()
+
+
+class TaskForm(forms.ModelForm):
+    depends_on = forms.ModelMultipleChoiceField(
+        queryset=Task.objects.none(),
+        required=False,
+        help_text="Tasks that must be done before this one can start.",
+    )
+
+    class Meta:
+        model = Task
+        fields = ['title', 'description', 'status', 'due_date', 'duration_days']
+
+    def __init__(self, *args, project, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.instance.project = project
+        candidates = project.tasks.order_by('due_date', 'pk')
+        if self.instance.pk:
+            candidates = candidates.exclude(pk=self.instance.pk)
+            self.initial.setdefault(
+                'depends_on', list(self.instance.dependency_links.values_list('depends_on_id', flat=True))
+            )
+        self.fields['depends_on'].queryset = candidates
+        self.fields['depends_on'].label_from_instance = lambda task: task.title
+
+    def clean_depends_on(self):
+        depends_on = self.cleaned_data['depends_on']
+        blocking = find_cycle(self.instance, [task.pk for task in depends_on])
+        if blocking:
+            raise forms.ValidationError(
+                f"'{blocking.title}' already depends on this task, directly or through other tasks."
+            )
+        return depends_on
+
+    def _save_m2m(self):
+        super()._save_m2m()
+        set_dependencies(self.instance, self.cleaned_data['depends_on'])
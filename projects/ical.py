@@ -0,0 +1,166 @@
+import hashlib
+import time
+from datetime import timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from teams.models import Membership
+from .models import CalendarFeed, Project, Task, Reminder
+
+# Only events inside this window are published; older or far-future items are
+# left out so the feed stays small and the range queries stay tight.
+PAST_DAYS = 90
+FUTURE_DAYS = 365
+CACHE_TIMEOUT = 60 * 60 * 24
+ITERATOR_CHUNK_SIZE = 500
+
+
+def feed_window(today=None):
+    today = today or timezone.now().date()
+    return today - timedelta(days=PAST_DAYS), today + timedelta(days=FUTURE_DAYS)
+
+
+def _version_key(user_id):
+    return f"ical-feed:{user_id}:version"
+
+
+def _token_key(token):
+    return f"ical-feed-token:{token}"
+
+
+def invalidate_feeds(user_ids):
+    """Bumps the feed version of each user once the transaction commits."""
+    keys = [_version_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), None))
+
+
+def invalidate_organization_feeds(organization_id=None, project_id=None):
+    """Every member sees the organization's events, so all their feeds change."""
+    members = Membership.objects.all()
+    if organization_id is not None:
+        members = members.filter(organization_id=organization_id)
+    else:
+        members = members.filter(organization__projects=project_id)
+    invalidate_feeds(list(members.values_list('user_id', flat=True)))
+
+
+def forget_token(token):
+    transaction.on_commit(lambda: cache.delete(_token_key(token)))
+
+
+def get_feed_owner_id(token):
+    """The user a feed token belongs to, or None. Cached so polls skip the database."""
+    key = _token_key(token)
+    owner_id = cache.get(key)
+    if owner_id is None:
+        owner_id = CalendarFeed.objects.filter(token=token).values_list('owner_id', flat=True).first()
+        if owner_id is None:
+            return None
+        cache.set(key, owner_id, CACHE_TIMEOUT)
+    return owner_id
+
+
+def get_feed_version(owner_id, token, today=None):
+    """
+    Changes whenever something the feed publishes changes (see
+    projects.signals), when the token is regenerated and when the day, and
+    with it the feed window, moves on.
+    """
+    version = cache.get_or_set(_version_key(owner_id), time.time_ns, None)
+    today = today or timezone.now().date()
+    return hashlib.sha1(f"{today}|{token}|{version}".encode()).hexdigest()
+
+
+def escape_text(value):
+    return (
+        str(value or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold(line):
+    """Folds a content line to 75 octets as required by RFC 5545."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte character.
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _event(uid, day, summary, description, stamp, url):
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f"DTSTAMP:{stamp.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')}",
+        f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}",
+        f'SUMMARY:{escape_text(summary)}',
+    ]
+    if description:
+        lines.append(f'DESCRIPTION:{escape_text(description)}')
+    lines.append(f'URL:{url}')
+    lines.append('END:VEVENT')
+    return ''.join(fold(line) for line in lines)
+
+
+def iter_calendar(user_id, project_url, today=None):
+    """
+    Yields the feed as text chunks, streaming each source with an indexed
+    range query instead of loading everything into memory. It covers the
+    organizations the user is currently a member of, not the projects they own,
+    so leaving a team takes its deadlines out of the feed.
+    `project_url` maps a project id to its absolute URL.
+    """
+    start, end = feed_window(today)
+    yield ''.join(fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Dovepeak//Projects Log//EN',
+        'CALSCALE:GREGORIAN',
+        'X-WR-CALNAME:DPL Deadlines',
+    ])
+
+    projects = Project.objects.filter(
+        organization__memberships__user=user_id, deadline__range=[start, end]
+    ).order_by().values_list('id', 'name', 'client', 'status', 'deadline', 'updated_at')
+    for pk, name, client, status, deadline, updated_at in projects.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield _event(
+            f'project-{pk}@dpl', deadline, f'Deadline: {name}',
+            f"Client: {client}\nStatus: {status}" if client else f"Status: {status}",
+            updated_at, project_url(pk),
+        )
+
+    tasks = Task.objects.filter(
+        project__organization__memberships__user=user_id, due_date__range=[start, end]
+    ).order_by().values_list('id', 'title', 'status', 'due_date', 'updated_at', 'project_id', 'project__name')
+    for pk, title, status, due_date, updated_at, project_id, project_name in tasks.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield _event(
+            f'task-{pk}@dpl', due_date, f'{project_name}: {title}', f'Status: {status}',
+            updated_at, project_url(project_id),
+        )
+
+    reminders = Reminder.objects.filter(
+        project__organization__memberships__user=user_id, reminder_date__range=[start, end]
+    ).order_by().values_list('id', 'message', 'reminder_date', 'updated_at', 'project_id', 'project__name')
+    for pk, message, reminder_date, updated_at, project_id, project_name in reminders.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield _event(
+            f'reminder-{pk}@dpl', reminder_date, f'Reminder: {project_name}', message,
+            updated_at, project_url(project_id),
+        )
+
+    yield fold('END:VCALENDAR')
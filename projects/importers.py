@@ -0,0 +1,257 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django import forms
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from products.facets import invalidate_facets
+from products.models import Product, Technology, parse_tech_stack
+from .ical import invalidate_organization_feeds
+from .models import Project, Task
+from .schedule import invalidate_schedule
+
+CHUNK_SIZE = 500
+IMPORT_KINDS = ['projects', 'tasks', 'products']
+IMPORT_FORMATS = ['csv', 'ndjson']
+
+
+class ProjectRowForm(forms.ModelForm):
+    class Meta:
+        model = Project
+        fields = ['name', 'client', 'description', 'start_date', 'deadline', 'status', 'progress']
+
+
+class TaskRowForm(forms.ModelForm):
+    class Meta:
+        model = Task
+        fields = ['title', 'description', 'status', 'due_date']
+
+
+class ProductRowForm(forms.ModelForm):
+    class Meta:
+        model = Product
+        fields = ['name', 'link', 'description', 'creation_date', 'version']
+
+
+ROW_FORMS = {
+    'projects': ProjectRowForm,
+    'tasks': TaskRowForm,
+    'products': ProductRowForm,
+}
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+        self.touched_projects = set()
+
+    @property
+    def has_errors(self):
+        return bool(self.errors)
+
+    def add_error(self, line, message):
+        self.errors.append((line, message))
+
+
+def detect_format(filename):
+    if filename and filename.lower().endswith(('.json', '.jsonl', '.ndjson')):
+        return 'ndjson'
+    return 'csv'
+
+
+def iter_rows(stream, fmt):
+    """
+    Yields (line_number, row_dict_or_None, error) without reading the whole
+    file into memory. Rows that cannot be parsed are yielded with an error.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row, None
+    else:
+        for line_number, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_number, None, f"Invalid JSON: {exc}"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, "Expected a JSON object per line."
+                continue
+            yield line_number, row, None
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _clean_row(row, form_class):
+    """Drops blank values so model defaults apply, then validates the row."""
+    model = form_class._meta.model
+    data = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ('', None):
+            continue
+        data[key.strip()] = value
+    for name in form_class._meta.fields:
+        field = model._meta.get_field(name)
+        if name not in data and field.has_default():
+            data[name] = field.get_default()
+    return form_class(data=data)
+
+
+def _format_errors(form):
+    return '; '.join(
+        f"{field}: {' '.join(messages)}" if field != '__all__' else ' '.join(messages)
+        for field, messages in form.errors.items()
+    )
+
+
+def _resolve_projects(organization, refs):
+    """Maps project references (ids or names) to project ids in one query."""
+    ids = {int(ref) for ref in refs if str(ref).isdigit()}
+    names = {str(ref) for ref in refs}
+    lookup = {}
+    matches = Project.objects.for_tenant(organization).filter(
+        Q(pk__in=ids) | Q(name__in=names)
+    ).order_by('pk').values_list('pk', 'name')
+    for pk, name in matches:
+        lookup.setdefault(str(pk), (pk, name))
+        lookup.setdefault(name, (pk, name))
+    return lookup
+
+
+def _build_instances(kind, user, organization, chunk, result):
+    form_class = ROW_FORMS[kind]
+    refs = set()
+    if kind in ('tasks', 'products'):
+        for _, row, error in chunk:
+            if row and row.get('project') not in (None, ''):
+                refs.add(str(row['project']).strip())
+    lookup = _resolve_projects(organization, refs) if refs else {}
+
+    now = timezone.now()
+    instances = []
+    for line_number, row, error in chunk:
+        if error:
+            result.add_error(line_number, error)
+            continue
+        form = _clean_row(row, form_class)
+        if not form.is_valid():
+            result.add_error(line_number, _format_errors(form))
+            continue
+        instance = form.save(commit=False)
+        ref = str(row.get('project') or '').strip()
+        if kind == 'projects':
+            instance.organization = organization
+            instance.owner = user
+            if instance.status == 'COMPLETED':
+                instance.completed_at = now
+        elif kind == 'tasks':
+            if not ref:
+                result.add_error(line_number, "project: This field is required.")
+                continue
+            if ref not in lookup:
+                result.add_error(line_number, f"project: No project matching '{ref}'.")
+                continue
+            instance.project_id = lookup[ref][0]
+            if instance.status == 'DONE':
+                instance.completed_at = now
+        elif kind == 'products':
+            instance.organization = organization
+            instance.owner = user
+            if ref:
+                if ref not in lookup:
+                    result.add_error(line_number, f"project: No project matching '{ref}'.")
+                    continue
+                instance.project_id = lookup[ref][0]
+            instance.tech_names = parse_tech_stack(str(row.get('tech_stack') or ''))
+        instances.append(instance)
+    return instances
+
+
+def attach_technologies(products):
+    """Tags freshly inserted products with one lookup and one insert per chunk."""
+    technologies = Technology.resolve(
+        name for product in products for name in product.tech_names
+    )
+    Through = Product.technologies.through
+    Through.objects.bulk_create([
+        Through(product_id=product.pk, technology_id=technologies[name.lower()].pk)
+        for product in products
+        for name in product.tech_names
+    ], ignore_conflicts=True)
+
+
+def recalculate_progress(project_ids, chunk_size=CHUNK_SIZE):
+    """Recomputes progress once per project using one aggregate query per chunk."""
+    for ids in chunked(sorted(project_ids), chunk_size):
+        projects = Project.objects.filter(pk__in=ids).annotate(
+            total_tasks=Count('tasks'),
+            done_tasks=Count('tasks', filter=Q(tasks__status='DONE')),
+        )
+        for project in projects:
+            project.update_progress(project.done_tasks, project.total_tasks)
+
+
+def import_rows(kind, user, organization, stream, fmt='csv', chunk_size=CHUNK_SIZE):
+    """
+    Streams rows from `stream` into `organization`, validates them chunk by
+    chunk and inserts each chunk with bulk_create in its own transaction.
+    Invalid rows are skipped and reported in the returned ImportResult.
+    """
+    if kind not in ROW_FORMS:
+        raise ValueError(f"Unknown import kind '{kind}'.")
+    model = ROW_FORMS[kind]._meta.model
+    result = ImportResult()
+
+    for chunk in chunked(iter_rows(stream, fmt), chunk_size):
+        instances = _build_instances(kind, user, organization, chunk, result)
+        if not instances:
+            continue
+        with transaction.atomic():
+            model.objects.bulk_create(instances, batch_size=chunk_size)
+            if kind == 'products':
+                attach_technologies(instances)
+        result.created += len(instances)
+        if kind == 'tasks':
+            result.touched_projects.update(task.project_id for task in instances)
+
+    if result.touched_projects:
+        recalculate_progress(result.touched_projects, chunk_size)
+        for project_id in result.touched_projects:
+            invalidate_schedule(project_id)
+    if kind in ('projects', 'tasks') and result.created:
+        # bulk_create skips the signals that normally bump the calendar feeds.
+        invalidate_organization_feeds(organization_id=organization.pk)
+    if kind == 'products' and result.created:
+        # bulk_create skips the signals that normally drop the facet cache.
+        invalidate_facets(organization.pk)
+    return result
+
+
+def import_upload(kind, user, organization, uploaded_file, fmt=None, chunk_size=CHUNK_SIZE):
+    fmt = fmt or detect_format(uploaded_file.name)
+    uploaded_file.seek(0)
+    stream = io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline='')
+    try:
+        return import_rows(kind, user, organization, stream, fmt, chunk_size)
+    finally:
+        stream.detach()
@@ -0,0 +1,148 @@
+import http.client
+import importlib.util
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+HOST = '127.0.0.1'
+
+
+def _client_thread(port, path, headers, count):
+    latencies, errors = [], 0
+    conn = http.client.HTTPConnection(HOST, port, timeout=30)
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+            if response.will_close:
+                conn.close()
+                conn = http.client.HTTPConnection(HOST, port, timeout=30)
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(HOST, port, timeout=30)
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    return latencies, errors
+
+
+def _client_process(port, path, headers, threads, per_thread):
+    # Runs in its own process so the load generator isn't limited by one GIL.
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(lambda _: _client_thread(port, path, headers, per_thread), range(threads)))
+    return [lat for lats, _ in results for lat in lats], sum(errors for _, errors in results)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare request throughput of the single-process server with the "
+        "pre-forked `serve` command on this machine."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/', help="URL to request (default: the dashboard).")
+        parser.add_argument('--user', help="Log in as this user, so protected pages can be measured.")
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--port', type=int, default=8799)
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options['user']:
+            headers['Cookie'] = f"{settings.SESSION_COOKIE_NAME}={self._login(options['user'])}"
+
+        manage_py = os.path.join(settings.BASE_DIR, 'manage.py')
+        bind = f"{HOST}:{options['port']}"
+        serve = [sys.executable, manage_py, 'serve', '--bind', bind, '--threads', str(options['threads'])]
+        if importlib.util.find_spec('uvicorn'):
+            # The way dpl.py serves the app today.
+            baseline = ('uvicorn, 1 process', [
+                sys.executable, '-m', 'uvicorn', f"--host={HOST}", f"--port={options['port']}",
+                '--workers=1', '--no-access-log', 'dpl_core.asgi:application',
+            ])
+        else:
+            baseline = ('serve, 1 process', serve + ['--workers', '1'])
+        modes = [
+            baseline,
+            (f"serve, {options['workers']} processes", serve + ['--workers', str(options['workers'])]),
+        ]
+
+        self.stdout.write(
+            f"GET {options['path']}: {options['requests']} requests, "
+            f"{options['concurrency']} concurrent clients, {os.cpu_count()} CPUs"
+        )
+        self.stdout.write(f"{'mode':<28}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for label, command in modes:
+            rate, p50, p95, errors = self._measure(command, options, headers)
+            self.stdout.write(f"{label:<28}{rate:>10.1f}{p50:>10.1f}{p95:>10.1f}{errors:>8}")
+
+    def _login(self, username):
+        from django.contrib.auth.models import User
+        from django.test import Client
+
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User '{username}' does not exist.")
+        client = Client()
+        client.force_login(user)
+        return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def _wait_until_ready(self, process, port, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError("The server exited during startup.")
+            try:
+                conn = http.client.HTTPConnection(HOST, port, timeout=2)
+                conn.request('GET', '/healthz/')
+                if conn.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.25)
+        raise CommandError("The server did not become ready in time.")
+
+    def _measure(self, command, options, headers):
+        port, path = options['port'], options['path']
+        process = subprocess.Popen(command, cwd=settings.BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            self._wait_until_ready(process, port)
+            _client_thread(port, path, headers, 20)  # warm-up
+
+            concurrency = max(1, options['concurrency'])
+            processes = min(concurrency, os.cpu_count() or 1)
+            threads = -(-concurrency // processes)
+            per_thread = max(1, options['requests'] // (processes * threads))
+            start = time.perf_counter()
+            with ProcessPoolExecutor(processes) as pool:
+                futures = [
+                    pool.submit(_client_process, port, path, headers, threads, per_thread)
+                    for _ in range(processes)
+                ]
+                results = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+        finally:
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+        latencies = sorted(lat for lats, _ in results for lat in lats)
+        errors = sum(errors for _, errors in results)
+        p50 = latencies[len(latencies) // 2] * 1000
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000
+        return len(latencies) / elapsed, p50, p95, errors
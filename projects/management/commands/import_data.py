@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from teams.models import Organization
+from projects.importers import CHUNK_SIZE, IMPORT_FORMATS, IMPORT_KINDS, detect_format, import_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk import projects, tasks or products from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=IMPORT_KINDS)
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help="Username that will own the imported rows.")
+        parser.add_argument(
+            '--organization', type=int,
+            help="Organization id to import into. Defaults to the user's first organization.",
+        )
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help="Defaults to the file extension.")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist.")
+
+        organizations = Organization.objects.filter(memberships__user=user).order_by('memberships__created_at')
+        if options['organization'] is not None:
+            organizations = organizations.filter(pk=options['organization'])
+        organization = organizations.first()
+        if organization is None:
+            raise CommandError(f"User '{user.username}' is not a member of that organization.")
+
+        fmt = options['format'] or detect_format(options['path'])
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                result = import_rows(options['kind'], user, organization, stream, fmt, options['chunk_size'])
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        for line, message in result.errors:
+            self.stderr.write(f"Line {line}: {message}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} {options['kind']} ({len(result.errors)} rows rejected)."
+        ))
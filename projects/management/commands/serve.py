@@ -0,0 +1,89 @@
+import importlib.util
+import logging
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dpl_core.prefork import Arbiter, check_application, create_listener
+from reports.jobs import drain as drain_report_jobs
+
+
+def parse_bind(value):
+    host, _, port = value.rpartition(':')
+    if not host or not port.isdigit():
+        raise CommandError(f"--bind expects HOST:PORT, got '{value}'.")
+    return host.strip('[]'), int(port)
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the site with pre-forked worker processes (Linux). Send HUP to "
+        "the master for a zero-downtime reload, TERM for a graceful stop. "
+        "Workers speak WSGI, so the live change feed at /events/ is off here; "
+        "run 'uvicorn dpl_core.asgi:application' for it, as a single process "
+        "since the feed's broker lives in memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bind', default='127.0.0.1:8000', help="HOST:PORT to listen on.")
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Worker processes (default: one per CPU core).",
+        )
+        parser.add_argument('--threads', type=int, default=4, help="Request threads per worker.")
+        parser.add_argument(
+            '--timeout', type=int, default=30,
+            help="Seconds a worker may go without a heartbeat before it is replaced.",
+        )
+        parser.add_argument(
+            '--graceful-timeout', type=int, default=30,
+            help="Seconds to let in-flight requests finish on stop or reload.",
+        )
+        parser.add_argument('--keepalive', type=int, default=5, help="Idle keep-alive timeout in seconds.")
+        parser.add_argument('--backlog', type=int, default=2048)
+        parser.add_argument('--access-log', action='store_true', help="Log every request.")
+        parser.add_argument('--pid', dest='pidfile', help="Write the master's PID to this file.")
+
+    def handle(self, *args, **options):
+        if not hasattr(os, 'fork'):
+            raise CommandError("The pre-fork server needs Linux or another Unix; use waitress on Windows.")
+        if importlib.util.find_spec('waitress') is None:
+            raise CommandError("The pre-fork server runs waitress in its workers; install the 'waitress' package.")
+        if options['workers'] < 1 or options['threads'] < 1:
+            raise CommandError("--workers and --threads must be at least 1.")
+        host, port = parse_bind(options['bind'])
+
+        prefork_logger = logging.getLogger('dpl_core.prefork')
+        if not prefork_logger.handlers:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(logging.Formatter('[%(asctime)s] [%(process)d] %(message)s'))
+            prefork_logger.addHandler(handler)
+            prefork_logger.setLevel(logging.INFO)
+
+        # Load the application once in the master; workers inherit it on fork.
+        from dpl_core.wsgi import application
+        try:
+            check_application(application)
+        except Exception as exc:
+            raise CommandError(f"The application failed its health check: {exc}")
+
+        try:
+            sock = create_listener(host, port, options['backlog'])
+        except OSError as exc:
+            raise CommandError(f"Could not listen on {host}:{port}: {exc}")
+
+        Arbiter(
+            application, sock,
+            workers=options['workers'],
+            threads=options['threads'],
+            timeout=options['timeout'],
+            graceful_timeout=options['graceful_timeout'],
+            keepalive=options['keepalive'],
+            backlog=options['backlog'],
+            access_log=options['access_log'],
+            pidfile=options['pidfile'],
+            # In-process report jobs (REPORT_WORKER_THREADS) finish, or are
+            # requeued, before a worker exits on stop, reload or scale-down.
+            worker_exit_hooks=[drain_report_jobs],
+        ).run()
@@ -0,0 +1,57 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_personal_organizations(apps, schema_editor):
+    """Existing projects move into their owner's personal organization."""
+    Membership = apps.get_model('teams', 'Membership')
+    Project = apps.get_model('projects', 'Project')
+
+    personal = {}
+    for user_id, organization_id in Membership.objects.filter(role='OWNER').order_by(
+        '-created_at', '-pk'
+    ).values_list('user_id', 'organization_id'):
+        personal[user_id] = organization_id  # oldest owned organization wins
+    owner_ids = Project.objects.filter(organization__isnull=True).values_list('owner_id', flat=True).distinct()
+    for owner_id in list(owner_ids):
+        Project.objects.filter(owner_id=owner_id, organization__isnull=True).update(
+            organization_id=personal[owner_id]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_calendarfeed_reminder_updated_at_and_more'),
+        ('teams', '0002_personal_organizations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='organization',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='projects', to='teams.organization'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['organization', 'deadline'], name='projects_pr_organiz_2b8415_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['organization', 'status'], name='projects_pr_organiz_8941e0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['organization', 'updated_at'], name='projects_pr_organiz_2fbd60_idx'),
+        ),
+        migrations.RunPython(assign_personal_organizations, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='project',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='projects', to='teams.organization'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-19 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_organization'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['organization', 'start_date', 'deadline'], name='projects_pr_organiz_4d3a2e_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-19 20:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_timeline_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='duration_days',
+            field=models.PositiveIntegerField(default=1, help_text='Days of work the task needs.'),
+        ),
+        migrations.CreateModel(
+            name='TaskDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depends_on', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependent_links', to='projects.task')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_dependencies', to='projects.project')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependency_links', to='projects.task')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('task', 'depends_on'), name='unique_task_dependency'), models.CheckConstraint(condition=models.Q(('task', models.F('depends_on')), _negated=True), name='task_dependency_not_self')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-19 21:10
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_completed_at(apps, schema_editor):
+    """Done tasks never recorded when they finished; their last edit is the best guess."""
+    Task = apps.get_model('projects', 'Task')
+    Task.objects.filter(status='DONE', completed_at__isnull=True).update(completed_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_task_duration_days_taskdependency'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+    ]
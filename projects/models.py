@@ -1,8 +1,13 @@
+import secrets
+
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.db.models import Avg, Count, Q
 
+from teams.models import Organization, TenantManager
+
 class Project(models.Model):
     STATUS_CHOICES = [
         ('NOT_STARTED', 'Not Started'),
@@ -12,6 +17,7 @@ class Project(models.Model):
         ('CANCELLED', 'Cancelled'),
     ]
 
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='projects')
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='projects')
     name = models.CharField(max_length=255)
     client = models.CharField(max_length=255, blank=True, null=True)
@@ -25,12 +31,36 @@ class Project(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = TenantManager()
+
     class Meta:
         ordering = ['-deadline']
+        indexes = [
+            models.Index(fields=['owner', 'deadline']),
+            models.Index(fields=['organization', 'deadline']),
+            models.Index(fields=['organization', 'status']),
+            models.Index(fields=['organization', 'updated_at']),
+            # Timeline window queries: start_date <= end AND deadline >= start
+            models.Index(fields=['organization', 'start_date', 'deadline']),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_facet_state = instance.facet_state()
+        return instance
+
+    def facet_state(self):
+        """The fields product facets show (see products.facets)."""
+        return (self.organization_id, self.name)
+
+    @property
+    def facets_changed(self):
+        return getattr(self, '_loaded_facet_state', None) != self.facet_state()
+
     def save(self, *args, **kwargs):
         if self.pk:
             old_project = Project.objects.get(pk=self.pk)
@@ -48,15 +78,18 @@ class Project(models.Model):
             return True
         return False
 
-    def update_progress(self):
+    def update_progress(self, done_tasks=None, total_tasks=None):
         """
         Recalculates progress based on tasks. 
         If no tasks exist, progress remains as manually set or default 0.
+        Callers that already aggregated the task counts (e.g. bulk imports)
+        can pass them in to skip the count queries.
         """
-        tasks = self.tasks.all()
-        if tasks.exists():
-            done_tasks = tasks.filter(status='DONE').count()
+        if total_tasks is None:
+            tasks = self.tasks.all()
             total_tasks = tasks.count()
+            done_tasks = tasks.filter(status='DONE').count() if total_tasks else 0
+        if total_tasks:
             self.progress = (done_tasks / total_tasks) * 100
         
         # Status automation
@@ -85,15 +118,40 @@ class Task(models.Model):
     description = models.TextField(blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='TODO')
     due_date = models.DateField(blank=True, null=True)
+    duration_days = models.PositiveIntegerField(default=1, help_text="Days of work the task needs.")
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'due_date']),
+        ]
 
     def __str__(self):
         return f"{self.project.name} - {self.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_schedule_state = instance.schedule_state()
+        return instance
+
+    def schedule_state(self):
+        """The fields the project's critical path depends on."""
+        return (self.duration_days, self.status == 'DONE')
+
+    @property
+    def schedule_changed(self):
+        return getattr(self, '_loaded_schedule_state', None) != self.schedule_state()
+
     def save(self, *args, **kwargs):
         is_new = self.pk is None
+        if self.status == 'DONE':
+            self.completed_at = self.completed_at or timezone.now()
+        else:
+            self.completed_at = None
         super().save(*args, **kwargs)
         # Recalculate project progress
         self.project.update_progress()
@@ -103,6 +161,35 @@ class Task(models.Model):
         super().delete(*args, **kwargs)
         project.update_progress()
 
+class TaskDependency(models.Model):
+    """`task` cannot start until `depends_on` is done. Both belong to `project`."""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='task_dependencies')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='dependency_links')
+    depends_on = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='dependent_links')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'depends_on'], name='unique_task_dependency'),
+            models.CheckConstraint(condition=~models.Q(task=models.F('depends_on')), name='task_dependency_not_self'),
+        ]
+
+    def __str__(self):
+        return f"{self.task.title} depends on {self.depends_on.title}"
+
+    def clean(self):
+        from .schedule import find_cycle
+
+        if self.task_id and self.depends_on_id:
+            if self.task.project_id != self.depends_on.project_id:
+                raise ValidationError("A task can only depend on tasks in the same project.")
+            blocking = find_cycle(self.task, [self.depends_on_id])
+            if blocking:
+                raise ValidationError(f"'{blocking.title}' already depends on '{self.task.title}'.")
+
+    def save(self, *args, **kwargs):
+        self.project_id = self.task.project_id
+        super().save(*args, **kwargs)
+
 class Reminder(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='reminders')
     reminder_date = models.DateField()
@@ -110,6 +197,12 @@ class Reminder(models.Model):
     is_sent = models.BooleanField(default=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'reminder_date']),
+        ]
 
     def __str__(self):
         return f"Reminder for {self.project.name} on {self.reminder_date}"
@@ -117,3 +210,31 @@ class Reminder(models.Model):
     @property
     def is_overdue(self):
         return self.reminder_date < timezone.now().date() and not self.is_sent
+
+def generate_feed_token():
+    return secrets.token_urlsafe(32)
+
+class CalendarFeed(models.Model):
+    """
+    Secret per-user token for the iCalendar feed, so calendar clients can
+    subscribe without a session.
+    """
+    owner = models.OneToOneField(User, on_delete=models.CASCADE, related_name='calendar_feed')
+    token = models.CharField(max_length=64, unique=True, default=generate_feed_token)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Calendar feed for {self.owner.username}"
+
+    @classmethod
+    def for_user(cls, user):
+        feed, _ = cls.objects.get_or_create(owner=user)
+        return feed
+
+    def regenerate_token(self):
+        from .ical import forget_token
+
+        forget_token(self.token)
+        self.token = generate_feed_token()
+        self.save(update_fields=['token'])
@@ -0,0 +1,67 @@
+"""
+Fires reminders on the live change feed once their date has come.
+
+While anyone is connected to the feed, the ASGI process checks every
+CHECK_INTERVAL seconds for unsent reminders that are due in organizations
+with open connections. It marks each one sent and publishes it, so the
+members watching get a notice. Reminders of organizations nobody is watching
+stay unsent until someone connects.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .events import broker
+from .models import Reminder
+from .signals import reminder_event
+
+CHECK_INTERVAL = 60
+
+_checker = None
+
+
+def fire_due_reminders(today=None):
+    """Marks due reminders of watched organizations sent and publishes them. Returns how many."""
+    today = today or timezone.now().date()
+    due = Reminder.objects.filter(
+        is_sent=False,
+        reminder_date__lte=today,
+        project__organization_id__in=broker.tenant_ids(),
+    ).select_related('project').order_by('reminder_date', 'pk')
+    fired = 0
+    for reminder in due:
+        # Claimed with a conditional UPDATE so a reminder fires only once.
+        if not Reminder.objects.filter(pk=reminder.pk, is_sent=False).update(is_sent=True, updated_at=timezone.now()):
+            continue
+        reminder.is_sent = True
+        broker.publish(reminder.project.organization_id, reminder_event(reminder))
+        fired += 1
+    return fired
+
+
+def _check_once():
+    close_old_connections()
+    try:
+        fire_due_reminders()
+    finally:
+        close_old_connections()
+
+
+async def _run_checks():
+    global _checker
+    try:
+        while broker.is_active():
+            await sync_to_async(_check_once, thread_sensitive=False)()
+            await asyncio.sleep(CHECK_INTERVAL)
+    finally:
+        _checker = None
+
+
+def ensure_reminder_checks():
+    """Starts the periodic check on the running loop unless it is already running."""
+    global _checker
+    if _checker is None:
+        _checker = asyncio.get_running_loop().create_task(_run_checks())
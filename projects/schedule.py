@@ -0,0 +1,161 @@
+"""
+Critical-path scheduling over task dependencies.
+
+The dependency graph of a project is reduced to one topological pass and the
+result (earliest start/finish and slack per task, in days from the start of
+the remaining work) is kept in the default cache under a per-project version
+that is bumped when a task's duration or status or an edge changes (see
+projects.signals). The bump happens on commit, so a schedule computed from
+uncommitted data is stored under a version that is never read again. Dates
+are filled in when the schedule is read, so it does not go stale as days pass
+or when the project's dates move.
+"""
+
+import time
+from collections import deque
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task, TaskDependency
+
+# Changes bump the version instead of relying on expiry; the timeout only
+# clears out superseded versions.
+SCHEDULE_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def _version_key(project_id):
+    return f"schedule:{project_id}:version"
+
+
+def invalidate_schedule(project_id):
+    transaction.on_commit(lambda: cache.set(_version_key(project_id), time.time_ns(), None))
+
+
+def find_cycle(task, depends_on_ids):
+    """
+    Returns a task among depends_on_ids that (transitively) depends on `task`,
+    i.e. one that would close a cycle, or None.
+    """
+    wanted = set(depends_on_ids)
+    if not wanted or task.pk is None:
+        return None
+    if task.pk in wanted:
+        return task
+    successors = {}
+    edges = TaskDependency.objects.filter(project_id=task.project_id).values_list('depends_on_id', 'task_id')
+    for depends_on_id, task_id in edges:
+        successors.setdefault(depends_on_id, []).append(task_id)
+
+    seen = {task.pk}
+    queue = deque([task.pk])
+    while queue:
+        for successor in successors.get(queue.popleft(), ()):
+            if successor in wanted:
+                return Task.objects.get(pk=successor)
+            if successor not in seen:
+                seen.add(successor)
+                queue.append(successor)
+    return None
+
+
+def set_dependencies(task, depends_on):
+    """Replaces the tasks `task` depends on. Callers check find_cycle first."""
+    wanted = {other.pk for other in depends_on}
+    current = set(task.dependency_links.values_list('depends_on_id', flat=True))
+    if wanted == current:
+        return
+    task.dependency_links.filter(depends_on_id__in=current - wanted).delete()
+    TaskDependency.objects.bulk_create([
+        TaskDependency(project_id=task.project_id, task=task, depends_on_id=pk) for pk in wanted - current
+    ])
+    # bulk_create skips the signals that normally invalidate the cached schedule.
+    invalidate_schedule(task.project_id)
+
+
+def compute_schedule(project_id):
+    """
+    Forward and backward pass over the project's tasks in topological order
+    (Kahn's algorithm), O(tasks + dependencies). Done tasks take no time.
+    Tasks caught in a cycle are left out and listed under 'cyclic'.
+    """
+    durations = {}
+    for pk, duration, status in Task.objects.filter(project_id=project_id).values_list('pk', 'duration_days', 'status'):
+        durations[pk] = 0 if status == 'DONE' else duration
+    predecessors = {pk: [] for pk in durations}
+    successors = {pk: [] for pk in durations}
+    edges = TaskDependency.objects.filter(project_id=project_id).values_list('task_id', 'depends_on_id')
+    for task_id, depends_on_id in edges:
+        predecessors[task_id].append(depends_on_id)
+        successors[depends_on_id].append(task_id)
+
+    waiting = {pk: len(preds) for pk, preds in predecessors.items()}
+    order = [pk for pk, count in waiting.items() if count == 0]
+    for pk in order:
+        for successor in successors[pk]:
+            waiting[successor] -= 1
+            if waiting[successor] == 0:
+                order.append(successor)
+
+    earliest_finish = {}
+    earliest_start = {}
+    for pk in order:
+        earliest_start[pk] = max((earliest_finish[pred] for pred in predecessors[pk]), default=0)
+        earliest_finish[pk] = earliest_start[pk] + durations[pk]
+    length = max(earliest_finish.values(), default=0)
+
+    latest_start = {}
+    for pk in reversed(order):
+        latest_finish = min((latest_start[succ] for succ in successors[pk] if succ in latest_start), default=length)
+        latest_start[pk] = latest_finish - durations[pk]
+
+    tasks = {pk: (earliest_start[pk], earliest_finish[pk], latest_start[pk] - earliest_start[pk]) for pk in order}
+    return {
+        'length': length,
+        'tasks': tasks,
+        'depends_on': {pk: preds for pk, preds in predecessors.items() if preds},
+        'critical': [pk for pk in order if tasks[pk][2] == 0 and durations[pk] > 0],
+        'cyclic': sorted(pk for pk in durations if pk not in tasks),
+    }
+
+
+def get_schedule(project_id):
+    version = cache.get_or_set(_version_key(project_id), time.time_ns, None)
+    key = f"schedule:{project_id}:{version}"
+    schedule = cache.get(key)
+    if schedule is None:
+        schedule = compute_schedule(project_id)
+        cache.set(key, schedule, SCHEDULE_CACHE_TIMEOUT)
+    return schedule
+
+
+def project_schedule(project, today=None):
+    """
+    The cached schedule with dates: remaining work starts today, or on the
+    project's start date if that is later.
+    """
+    schedule = get_schedule(project.pk)
+    today = today or timezone.now().date()
+    anchor = max(project.start_date, today)
+    finish = anchor + timedelta(days=schedule['length'])
+    critical = set(schedule['critical'])
+    return {
+        'start': anchor,
+        'finish': finish,
+        'length': schedule['length'],
+        'deadline_slack': (project.deadline - finish).days,
+        'critical': schedule['critical'],
+        'cyclic': schedule['cyclic'],
+        'tasks': {
+            pk: {
+                'earliest_start': anchor + timedelta(days=start),
+                'earliest_finish': anchor + timedelta(days=finish_day),
+                'slack': slack,
+                'critical': pk in critical,
+                'depends_on': schedule['depends_on'].get(pk, []),
+            }
+            for pk, (start, finish_day, slack) in schedule['tasks'].items()
+        },
+    }
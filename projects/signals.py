@@ -0,0 +1,120 @@
+"""
+Publishes model changes to the live change feed and keeps the cached task
+schedules and calendar feed versions in sync. Feed receivers return early while
+nobody is connected (e.g. under WSGI), so the feed costs nothing when unused.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from teams.models import Membership
+from .events import broker
+from .ical import forget_token, invalidate_feeds, invalidate_organization_feeds
+from .models import CalendarFeed, Project, Task, TaskDependency, Reminder
+from .schedule import invalidate_schedule
+
+
+@receiver(post_save, sender=Task)
+def task_schedule_changed(sender, instance, created, **kwargs):
+    if created or instance.schedule_changed:
+        invalidate_schedule(instance.project_id)
+    instance._loaded_schedule_state = instance.schedule_state()
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=TaskDependency)
+@receiver(post_delete, sender=TaskDependency)
+def task_graph_changed(sender, instance, **kwargs):
+    invalidate_schedule(instance.project_id)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_feed_changed(sender, instance, **kwargs):
+    invalidate_organization_feeds(organization_id=instance.organization_id)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Reminder)
+@receiver(post_delete, sender=Reminder)
+def project_item_feed_changed(sender, instance, **kwargs):
+    # Looked up by project id: the project may already be gone in a cascade,
+    # in which case its own receiver has bumped the feeds.
+    invalidate_organization_feeds(project_id=instance.project_id)
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def membership_feed_changed(sender, instance, **kwargs):
+    invalidate_feeds([instance.user_id])
+
+
+@receiver(post_delete, sender=CalendarFeed)
+def calendar_feed_deleted(sender, instance, **kwargs):
+    forget_token(instance.token)
+
+
+def publish_on_commit(tenant_id, event):
+    if broker.has_subscribers(tenant_id):
+        transaction.on_commit(lambda: broker.publish(tenant_id, event))
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    if not broker.is_active():
+        return
+    publish_on_commit(instance.organization_id, {
+        'type': 'project',
+        'id': instance.pk,
+        'progress': round(instance.progress or 0),
+        'status': instance.status,
+        'status_display': instance.get_status_display(),
+    })
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    if not broker.is_active():
+        return
+    publish_on_commit(instance.project.organization_id, {
+        'type': 'task',
+        'id': instance.pk,
+        'project_id': instance.project_id,
+        'created': created,
+        'title': instance.title,
+        'status': instance.status,
+        'due_date': instance.due_date.isoformat() if instance.due_date else None,
+    })
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    if not broker.is_active():
+        return
+    publish_on_commit(instance.project.organization_id, {
+        'type': 'task_deleted',
+        'id': instance.pk,
+        'project_id': instance.project_id,
+    })
+
+
+def reminder_event(reminder, created=False):
+    return {
+        'type': 'reminder',
+        'id': reminder.pk,
+        'project_id': reminder.project_id,
+        'project_name': reminder.project.name,
+        'message': reminder.message or '',
+        'reminder_date': reminder.reminder_date.isoformat(),
+        'is_sent': reminder.is_sent,
+        'created': created,
+    }
+
+
+@receiver(post_save, sender=Reminder)
+def reminder_saved(sender, instance, created, **kwargs):
+    if not broker.is_active():
+        return
+    publish_on_commit(instance.project.organization_id, reminder_event(instance, created))
@@ -1,3 +1,332 @@
+import io
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from django.urls import reverse
+
+from teams.models import Membership, Organization
+from teams.tenancy import TENANT_SESSION_KEY
+from .forms import TaskForm
+from .importers import import_rows
+from .models import Project, Reminder, Task, TaskDependency
+from .reminders import fire_due_reminders
+from .schedule import compute_schedule, get_schedule, project_schedule, set_dependencies
+
+
+class ScheduleTests(TestCase):
+    def setUp(self):
+        # Primary keys are reused between tests; don't read another test's schedule.
+        cache.clear()
+        self.user = User.objects.create_user('planner', password='pw')
+        self.organization = Organization.create_personal(self.user)
+        self.project = Project.objects.create(
+            organization=self.organization, owner=self.user, name='Launch',
+            start_date=date(2026, 1, 5), deadline=date(2026, 1, 12),
+        )
+
+    def add_task(self, title, duration, status='TODO'):
+        return Task.objects.create(project=self.project, title=title, duration_days=duration, status=status)
+
+    def depend(self, task, *depends_on):
+        with self.captureOnCommitCallbacks(execute=True):
+            set_dependencies(task, depends_on)
+
+    def test_form_rejects_cycle(self):
+        a = self.add_task('A', 1)
+        b = self.add_task('B', 1)
+        c = self.add_task('C', 1)
+        self.depend(b, a)
+        self.depend(c, b)
+
+        form = TaskForm(
+            data={'title': 'A', 'status': 'TODO', 'duration_days': 1, 'depends_on': [c.pk]},
+            instance=a, project=self.project,
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn('depends_on', form.errors)
+        self.assertEqual(TaskDependency.objects.filter(task=a).count(), 0)
+
+    def test_model_validation_rejects_cycle(self):
+        a = self.add_task('A', 1)
+        b = self.add_task('B', 1)
+        self.depend(b, a)
+
+        with self.assertRaises(ValidationError):
+            TaskDependency(task=a, depends_on=b).full_clean()
+
+    def test_diamond_slack_and_critical_path(self):
+        # A -> (B, C) -> D; the longer branch through C is critical.
+        a = self.add_task('A', 2)
+        b = self.add_task('B', 1)
+        c = self.add_task('C', 4)
+        d = self.add_task('D', 3)
+        self.depend(b, a)
+        self.depend(c, a)
+        self.depend(d, b, c)
+
+        schedule = compute_schedule(self.project.pk)
+        self.assertEqual(schedule['length'], 9)
+        self.assertEqual(schedule['tasks'][a.pk], (0, 2, 0))
+        self.assertEqual(schedule['tasks'][b.pk], (2, 3, 3))
+        self.assertEqual(schedule['tasks'][c.pk], (2, 6, 0))
+        self.assertEqual(schedule['tasks'][d.pk], (6, 9, 0))
+        self.assertEqual(schedule['critical'], [a.pk, c.pk, d.pk])
+        self.assertEqual(schedule['cyclic'], [])
+
+        dated = project_schedule(self.project, today=date(2026, 1, 1))
+        self.assertEqual(dated['start'], date(2026, 1, 5))
+        self.assertEqual(dated['finish'], date(2026, 1, 14))
+        self.assertEqual(dated['deadline_slack'], -2)
+        self.assertEqual(dated['tasks'][d.pk]['earliest_start'], date(2026, 1, 11))
+
+    def test_done_tasks_take_no_time(self):
+        a = self.add_task('A', 5, status='DONE')
+        b = self.add_task('B', 2)
+        self.depend(b, a)
+
+        schedule = compute_schedule(self.project.pk)
+        self.assertEqual(schedule['length'], 2)
+        self.assertEqual(schedule['tasks'][a.pk], (0, 0, 0))
+        self.assertEqual(schedule['tasks'][b.pk], (0, 2, 0))
+        self.assertEqual(schedule['critical'], [b.pk])
+
+    def test_cache_invalidated_on_duration_change(self):
+        a = self.add_task('A', 2)
+        self.assertEqual(get_schedule(self.project.pk)['length'], 2)
+
+        # Bypasses the signals, so the cached schedule is still served.
+        Task.objects.filter(pk=a.pk).update(duration_days=3)
+        self.assertEqual(get_schedule(self.project.pk)['length'], 2)
+
+        a = Task.objects.get(pk=a.pk)
+        a.duration_days = 4
+        with self.captureOnCommitCallbacks(execute=True):
+            a.save()
+        self.assertEqual(get_schedule(self.project.pk)['length'], 4)
+
+    def test_cache_kept_on_unrelated_change(self):
+        a = self.add_task('A', 2)
+        get_schedule(self.project.pk)
+        Task.objects.filter(pk=a.pk).update(duration_days=3)
+
+        a = Task.objects.get(pk=a.pk)
+        a.title = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            a.save()
+        self.assertEqual(get_schedule(self.project.pk)['length'], 2)
+
+    def test_cache_invalidated_on_edge_change(self):
+        a = self.add_task('A', 2)
+        b = self.add_task('B', 3)
+        self.assertEqual(get_schedule(self.project.pk)['length'], 3)
+
+        self.depend(b, a)
+        self.assertEqual(get_schedule(self.project.pk)['length'], 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            TaskDependency.objects.get(task=b, depends_on=a).delete()
+        self.assertEqual(get_schedule(self.project.pk)['length'], 3)
+
+
+class ImportRowsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('importer', password='pw')
+        self.organization = Organization.create_personal(self.user)
+        self.alpha = Project.objects.create(
+            organization=self.organization, owner=self.user, name='Alpha', deadline=date(2026, 6, 1),
+        )
+        self.beta = Project.objects.create(
+            organization=self.organization, owner=self.user, name='Beta', deadline=date(2026, 6, 1),
+        )
+        other_user = User.objects.create_user('outsider', password='pw')
+        self.foreign = Project.objects.create(
+            organization=Organization.create_personal(other_user), owner=other_user,
+            name='Foreign', deadline=date(2026, 6, 1),
+        )
+
+    def run_import(self, kind, text, fmt='csv', chunk_size=500):
+        return import_rows(kind, self.user, self.organization, io.StringIO(text), fmt, chunk_size)
+
+    def test_csv_reports_invalid_rows_by_line(self):
+        result = self.run_import('projects', (
+            "name,deadline,status\n"
+            "Good,2026-07-01,\n"
+            ",2026-07-01,\n"
+            "Bad date,soon,\n"
+            "Bad status,2026-07-01,DREAMING\n"
+        ))
+        self.assertEqual(result.created, 1)
+        self.assertEqual([line for line, _ in result.errors], [3, 4, 5])
+        self.assertIn('name:', result.errors[0][1])
+        self.assertIn('deadline:', result.errors[1][1])
+        self.assertIn('status:', result.errors[2][1])
+        self.assertTrue(Project.objects.filter(organization=self.organization, name='Good').exists())
+
+    def test_ndjson_reports_invalid_rows_by_line(self):
+        result = self.run_import('projects', (
+            '{"name": "Good", "deadline": "2026-07-01"}\n'
+            '\n'
+            '{"name": "Broken",\n'
+            '["not", "an", "object"]\n'
+            '{"name": "No deadline"}\n'
+        ), fmt='ndjson')
+        self.assertEqual(result.created, 1)
+        self.assertEqual([line for line, _ in result.errors], [3, 4, 5])
+        self.assertTrue(result.errors[0][1].startswith('Invalid JSON'))
+        self.assertEqual(result.errors[1][1], "Expected a JSON object per line.")
+        self.assertIn('deadline:', result.errors[2][1])
+
+    def test_tasks_resolve_projects_by_id_and_name(self):
+        result = self.run_import('tasks', (
+            "project,title\n"
+            f"{self.alpha.pk},By id\n"
+            "Beta,By name\n"
+            f"{self.foreign.pk},Other organization\n"
+            "Gamma,Unknown\n"
+            ",Missing\n"
+        ))
+        self.assertEqual(result.created, 2)
+        self.assertEqual(list(self.alpha.tasks.values_list('title', flat=True)), ['By id'])
+        self.assertEqual(list(self.beta.tasks.values_list('title', flat=True)), ['By name'])
+        self.assertFalse(self.foreign.tasks.exists())
+        self.assertEqual(result.errors, [
+            (4, f"project: No project matching '{self.foreign.pk}'."),
+            (5, "project: No project matching 'Gamma'."),
+            (6, "project: This field is required."),
+        ])
+
+    def test_rows_span_chunks(self):
+        rows = [f"Alpha,Task {n},TODO" for n in range(7)]
+        rows[3] = "Alpha,,TODO"
+        result = self.run_import('tasks', "project,title,status\n" + "\n".join(rows) + "\n", chunk_size=2)
+        self.assertEqual(result.created, 6)
+        self.assertEqual([line for line, _ in result.errors], [5])
+        self.assertEqual(self.alpha.tasks.count(), 6)
+
+    def test_progress_recalculated_once_per_project(self):
+        rows = ["project,title,status"]
+        rows += [f"Alpha,A{n},DONE" for n in range(3)] + ["Alpha,A3,TODO"]
+        rows += [f"Beta,B{n},TODO" for n in range(3)]
+        update_progress = Project.update_progress
+        with mock.patch.object(Project, 'update_progress', autospec=True, side_effect=update_progress) as patched:
+            result = self.run_import('tasks', "\n".join(rows) + "\n", chunk_size=2)
+
+        self.assertEqual(result.touched_projects, {self.alpha.pk, self.beta.pk})
+        self.assertEqual(sorted(call.args[0].pk for call in patched.call_args_list), [self.alpha.pk, self.beta.pk])
+        self.alpha.refresh_from_db()
+        self.beta.refresh_from_db()
+        self.assertEqual(self.alpha.progress, 75)
+        self.assertEqual(self.alpha.status, 'IN_PROGRESS')
+        self.assertEqual(self.beta.progress, 0)
+
+
+class FireDueRemindersTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('reminded', password='pw')
+        self.organization = Organization.create_personal(self.user)
+        self.project = Project.objects.create(
+            organization=self.organization, owner=self.user, name='Launch', deadline=date(2026, 6, 1),
+        )
+
+    def test_due_reminders_of_watched_organizations_fire_once(self):
+        due = Reminder.objects.create(project=self.project, reminder_date=date(2026, 3, 1), message='Call')
+        Reminder.objects.create(project=self.project, reminder_date=date(2026, 3, 5), message='Later')
+        with mock.patch('projects.reminders.broker') as broker:
+            broker.tenant_ids.return_value = [self.organization.pk]
+            self.assertEqual(fire_due_reminders(today=date(2026, 3, 2)), 1)
+            self.assertEqual(fire_due_reminders(today=date(2026, 3, 2)), 0)
+
+        organization_id, event = broker.publish.call_args.args
+        self.assertEqual(organization_id, self.organization.pk)
+        self.assertEqual((event['type'], event['id'], event['is_sent']), ('reminder', due.pk, True))
+        self.assertEqual(list(Reminder.objects.filter(is_sent=True)), [due])
+
+    def test_unwatched_organizations_keep_their_reminders(self):
+        Reminder.objects.create(project=self.project, reminder_date=date(2026, 3, 1))
+        with mock.patch('projects.reminders.broker') as broker:
+            broker.tenant_ids.return_value = []
+            self.assertEqual(fire_due_reminders(today=date(2026, 3, 2)), 0)
+        self.assertFalse(Reminder.objects.filter(is_sent=True).exists())
+
+
+class TenantIsolationTests(TestCase):
+    def setUp(self):
+        # Cached memberships are keyed by user id, which tests reuse.
+        cache.clear()
+        self.member = User.objects.create_user('member', password='pw')
+        self.organization = self.member.organizations.get()
+        self.project = Project.objects.create(
+            organization=self.organization, owner=self.member, name='Ours', deadline=date(2026, 6, 1),
+        )
+        self.task = Task.objects.create(project=self.project, title='Our task')
+
+        outsider = User.objects.create_user('outsider', password='pw')
+        self.foreign_project = Project.objects.create(
+            organization=outsider.organizations.get(), owner=outsider, name='Theirs', deadline=date(2026, 6, 1),
+        )
+        self.foreign_task = Task.objects.create(project=self.foreign_project, title='Their task')
+
+        self.client.force_login(self.member)
+
+    def login_as_viewer(self):
+        viewer = User.objects.create_user('viewer', password='pw')
+        Membership.objects.create(organization=self.organization, user=viewer, role='VIEWER')
+        self.client.force_login(viewer)
+        session = self.client.session
+        session[TENANT_SESSION_KEY] = self.organization.pk
+        session.save()
+
+    def test_other_organizations_projects_are_not_found(self):
+        for name in ['project_detail', 'project_update', 'project_delete', 'project_schedule']:
+            with self.subTest(name):
+                self.assertEqual(self.client.get(reverse(name, args=[self.project.pk])).status_code, 200)
+                self.assertEqual(self.client.get(reverse(name, args=[self.foreign_project.pk])).status_code, 404)
+        url = reverse('task_create', kwargs={'project_id': self.foreign_project.pk})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_other_organizations_projects_cannot_be_changed(self):
+        response = self.client.post(reverse('project_update', args=[self.foreign_project.pk]), {
+            'name': 'Taken', 'start_date': '2026-01-01', 'deadline': '2026-06-01', 'status': 'ON_HOLD',
+        })
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.post(reverse('project_delete', args=[self.foreign_project.pk])).status_code, 404)
+        self.foreign_project.refresh_from_db()
+        self.assertEqual(self.foreign_project.name, 'Theirs')
+
+    def test_other_organizations_tasks_are_not_found(self):
+        self.assertEqual(self.client.get(reverse('task_update', args=[self.foreign_task.pk])).status_code, 404)
+        response = self.client.post(reverse('task_status_update', args=[self.foreign_task.pk]), {'status': 'DONE'})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.post(reverse('task_delete', args=[self.foreign_task.pk])).status_code, 404)
+        self.foreign_task.refresh_from_db()
+        self.assertEqual(self.foreign_task.status, 'TODO')
+
+    def test_lists_only_show_the_active_organization(self):
+        response = self.client.get(reverse('project_list'))
+        self.assertContains(response, 'Ours')
+        self.assertNotContains(response, 'Theirs')
+
+    def test_viewer_can_read_but_not_edit(self):
+        self.login_as_viewer()
+        self.assertEqual(self.client.get(reverse('project_detail', args=[self.project.pk])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('project_schedule', args=[self.project.pk])).status_code, 200)
+
+        for url in [
+            reverse('project_create'),
+            reverse('project_update', args=[self.project.pk]),
+            reverse('project_delete', args=[self.project.pk]),
+            reverse('task_create', kwargs={'project_id': self.project.pk}),
+            reverse('task_update', args=[self.task.pk]),
+            reverse('project_import'),
+        ]:
+            with self.subTest(url):
+                self.assertEqual(self.client.get(url).status_code, 403)
 
-# Create your tests here.
+        response = self.client.post(reverse('task_status_update', args=[self.task.pk]), {'status': 'DONE'})
+        self.assertEqual(response.status_code, 403)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'TODO')
@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+
+from django.db.models import Max, Min
+
+from .models import Project, Task
+
+# Longest window one request may ask for; the timeline page loads smaller
+# chunks as the user scrolls.
+MAX_WINDOW_DAYS = 731
+EPOCH = date(1970, 1, 1)
+STATUSES = [code for code, _ in Project.STATUS_CHOICES]
+_STATUS_INDEX = {code: index for index, code in enumerate(STATUSES)}
+
+
+def day_number(value):
+    return (value - EPOCH).days
+
+
+def parse_window(params):
+    """Reads ?start=&end= (ISO dates). Raises ValueError for a bad window."""
+    try:
+        start = date.fromisoformat(params.get('start', ''))
+        end = date.fromisoformat(params.get('end', ''))
+    except ValueError:
+        raise ValueError("start and end must be dates (YYYY-MM-DD).")
+    if end < start:
+        raise ValueError("end must not be before start.")
+    if end - start > timedelta(days=MAX_WINDOW_DAYS):
+        raise ValueError(f"The window may span at most {MAX_WINDOW_DAYS} days.")
+    return start, end
+
+
+def timeline_window(organization, start, end, with_bounds=False):
+    """
+    Projects overlapping [start, end] and the due dates of their tasks in that
+    range, as columns rather than one object per row. Dates are day numbers
+    since 1970-01-01 and statuses are indexes into `statuses`.
+    """
+    projects = Project.objects.for_tenant(organization).filter(start_date__lte=end, deadline__gte=start)
+    columns = {'id': [], 'name': [], 'start': [], 'end': [], 'status': [], 'progress': []}
+    rows = projects.order_by('start_date', 'pk').values_list(
+        'pk', 'name', 'start_date', 'deadline', 'status', 'progress'
+    )
+    for pk, name, start_date, deadline, status, progress in rows:
+        columns['id'].append(pk)
+        columns['name'].append(name)
+        columns['start'].append(day_number(start_date))
+        columns['end'].append(day_number(deadline))
+        columns['status'].append(_STATUS_INDEX.get(status, 0))
+        columns['progress'].append(round(progress or 0))
+
+    tasks = {'project': [], 'due': [], 'done': []}
+    task_rows = Task.objects.filter(
+        project__organization=organization,
+        project__start_date__lte=end,
+        project__deadline__gte=start,
+        due_date__range=(start, end),
+    ).order_by().values_list('project_id', 'due_date', 'status')
+    for project_id, due_date, status in task_rows:
+        tasks['project'].append(project_id)
+        tasks['due'].append(day_number(due_date))
+        tasks['done'].append(1 if status == 'DONE' else 0)
+
+    data = {
+        'start': day_number(start),
+        'end': day_number(end),
+        'statuses': STATUSES,
+        'projects': columns,
+        'tasks': tasks,
+    }
+    if with_bounds:
+        bounds = Project.objects.for_tenant(organization).aggregate(first=Min('start_date'), last=Max('deadline'))
+        data['bounds'] = [
+            day_number(bounds['first']) if bounds['first'] else None,
+            day_number(bounds['last']) if bounds['last'] else None,
+        ]
+    return data
@@ -11,6 +11,10 @@ urlpatterns = [
     path('projects/<int:pk>/', views.ProjectDetailView.as_view(), name='project_detail'),
     path('projects/<int:pk>/update/', views.ProjectUpdateView.as_view(), name='project_update'),
     path('projects/<int:pk>/delete/', views.ProjectDeleteView.as_view(), name='project_delete'),
+    path('projects/<int:pk>/schedule/', views.schedule_data, name='project_schedule'),
+    path('projects/import/', views.ImportView.as_view(), name='project_import'),
+    path('timeline/', views.TimelineView.as_view(), name='timeline'),
+    path('timeline/data/', views.timeline_data, name='timeline_data'),
     
     # Tasks
     path('projects/<int:project_id>/tasks/create/', views.TaskCreateView.as_view(), name='task_create'),
@@ -22,4 +26,14 @@ urlpatterns = [
     path('reminders/', views.ReminderListView.as_view(), name='reminder_list'),
     path('reminders/create/', views.ReminderCreateView.as_view(), name='reminder_create'),
     path('settings/', views.SettingsView.as_view(), name='settings'),
+    path('settings/calendar/reset/', views.CalendarFeedResetView.as_view(), name='calendar_feed_reset'),
+
+    # Live change feed (server-sent events, ASGI only)
+    path('events/', views.event_stream, name='event_stream'),
+
+    # Health check for load balancers and process managers
+    path('healthz/', views.health_check, name='health_check'),
+
+    # Calendar feed (token-authenticated for calendar clients)
+    path('calendar/<str:token>.ics', views.calendar_feed, name='calendar_feed'),
 ]
\ No newline at end of file
@@ -1,34 +1,49 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView, FormView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.db import DatabaseError, connection
 from django.db.models import Count, Q
+from django.core.handlers.asgi import ASGIRequest
 from datetime import timedelta
-
-from .models import Project, Task, Reminder
-
-class DashboardView(LoginRequiredMixin, TemplateView):
+import asyncio
+import json
+
+from .models import Project, Task, Reminder, CalendarFeed
+from .forms import ImportForm, TaskForm
+from .importers import import_upload
+from .ical import CACHE_TIMEOUT, get_feed_owner_id, get_feed_version, iter_calendar
+from .events import broker
+from .reminders import ensure_reminder_checks
+from .schedule import project_schedule
+from .timeline import parse_window, timeline_window
+from reports.models import ReportJob
+from teams.mixins import TenantRequiredMixin, TenantEditRequiredMixin, tenant_required
+
+class DashboardView(TenantRequiredMixin, TemplateView):
     template_name = 'projects/dashboard.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = self.request.user
-        base_qs = Project.objects.filter(owner=user)
+        base_qs = Project.objects.for_tenant(self.request.tenant)
         
         today = timezone.now().date()
         next_week = today + timedelta(days=7)
 
-        context['total_projects'] = base_qs.count()
-        context['active_projects'] = base_qs.filter(status='IN_PROGRESS').count()
-        context['completed_projects'] = base_qs.filter(status='COMPLETED').count()
-        
-        # Overdue logic
-        context['overdue_projects'] = base_qs.filter(
-            deadline__lt=today
-        ).exclude(status='COMPLETED').count()
+        # Tenant-wide counters in a single aggregate query
+        counts = base_qs.aggregate(
+            total_projects=Count('pk'),
+            active_projects=Count('pk', filter=Q(status='IN_PROGRESS')),
+            completed_projects=Count('pk', filter=Q(status='COMPLETED')),
+            # Overdue logic
+            overdue_projects=Count('pk', filter=Q(deadline__lt=today) & ~Q(status='COMPLETED')),
+        )
+        context.update(counts)
 
         # Upcoming deadlines (within 7 days)
         context['upcoming_deadlines'] = base_qs.filter(
@@ -41,13 +56,14 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         return context
 
 # Project Views
-class ProjectListView(LoginRequiredMixin, ListView):
+class ProjectListView(TenantRequiredMixin, ListView):
     model = Project
     context_object_name = 'projects'
     template_name = 'projects/project_list.html'
 
     def get_queryset(self):
-        queryset = Project.objects.filter(owner=self.request.user).select_related('owner')
+        # The nightly forecast comes along in the same query.
+        queryset = Project.objects.for_tenant(self.request.tenant).select_related('owner', 'forecast')
         query = self.request.GET.get('q')
         if query:
             queryset = queryset.filter(
@@ -55,15 +71,29 @@ class ProjectListView(LoginRequiredMixin, ListView):
             )
         return queryset
 
-class ProjectDetailView(LoginRequiredMixin, DetailView):
+class ProjectDetailView(TenantRequiredMixin, DetailView):
     model = Project
     context_object_name = 'project'
     template_name = 'projects/project_detail.html'
 
     def get_queryset(self):
-        return Project.objects.filter(owner=self.request.user).prefetch_related('tasks', 'reminders')
+        return Project.objects.for_tenant(self.request.tenant).prefetch_related('tasks', 'reminders')
 
-class ProjectCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['report_formats'] = ReportJob.FORMAT_CHOICES
+
+        # Critical path from the cached schedule; the graph is not walked per view.
+        schedule = project_schedule(self.object)
+        titles = {task.pk: task.title for task in self.object.tasks.all()}
+        for task in self.object.tasks.all():
+            task.schedule = schedule['tasks'].get(task.pk)
+            if task.schedule:
+                task.schedule['depends_on_titles'] = [titles[pk] for pk in task.schedule['depends_on'] if pk in titles]
+        context['schedule'] = schedule
+        return context
+
+class ProjectCreateView(TenantEditRequiredMixin, SuccessMessageMixin, CreateView):
     model = Project
     fields = ['name', 'client', 'description', 'start_date', 'deadline', 'status']
     template_name = 'projects/project_form.html'
@@ -71,10 +101,11 @@ class ProjectCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     success_message = "Project '%(name)s' was created successfully."
 
     def form_valid(self, form):
+        form.instance.organization = self.request.tenant
         form.instance.owner = self.request.user
         return super().form_valid(form)
 
-class ProjectUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
+class ProjectUpdateView(TenantEditRequiredMixin, SuccessMessageMixin, UpdateView):
     model = Project
     fields = ['name', 'client', 'description', 'start_date', 'deadline', 'status']
     template_name = 'projects/project_form.html'
@@ -82,64 +113,122 @@ class ProjectUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     success_message = "Project '%(name)s' was updated successfully."
 
     def get_queryset(self):
-        return Project.objects.filter(owner=self.request.user)
+        return Project.objects.for_tenant(self.request.tenant)
 
-class ProjectDeleteView(LoginRequiredMixin, DeleteView):
+class ProjectDeleteView(TenantEditRequiredMixin, DeleteView):
     model = Project
     template_name = 'projects/project_confirm_delete.html'
     success_url = reverse_lazy('project_list')
 
     def get_queryset(self):
-        return Project.objects.filter(owner=self.request.user)
+        return Project.objects.for_tenant(self.request.tenant)
 
     def delete(self, request, *args, **kwargs):
         obj = self.get_object()
         messages.success(self.request, f"Project '{obj.name}' was deleted.")
         return super().delete(request, *args, **kwargs)
 
+class ImportView(TenantEditRequiredMixin, FormView):
+    form_class = ImportForm
+    template_name = 'projects/import_form.html'
+
+    def form_valid(self, form):
+        result = import_upload(
+            form.cleaned_data['kind'],
+            self.request.user,
+            self.request.tenant,
+            form.cleaned_data['file'],
+            form.cleaned_data['format'] or None,
+        )
+        if result.created:
+            messages.success(self.request, f"Imported {result.created} {form.cleaned_data['kind']}.")
+        return self.render_to_response(self.get_context_data(form=form, result=result))
+
+class TimelineView(TenantRequiredMixin, TemplateView):
+    template_name = 'projects/timeline.html'
+
+@tenant_required
+def timeline_data(request):
+    """Columnar JSON for the timeline page: projects overlapping ?start=&end=."""
+    try:
+        start, end = parse_window(request.GET)
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse(timeline_window(request.tenant, start, end, with_bounds='bounds' in request.GET))
+
 # Task Views
-class TaskCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
+@tenant_required
+def schedule_data(request, pk):
+    project = get_object_or_404(Project.objects.for_tenant(request.tenant), pk=pk)
+    schedule = project_schedule(project)
+    return JsonResponse({
+        'project': project.pk,
+        'start': schedule['start'].isoformat(),
+        'finish': schedule['finish'].isoformat(),
+        'deadline': project.deadline.isoformat(),
+        'deadline_slack': schedule['deadline_slack'],
+        'critical_path': schedule['critical'],
+        'cyclic': schedule['cyclic'],
+        'tasks': [
+            {
+                'id': task_id,
+                'earliest_start': task['earliest_start'].isoformat(),
+                'earliest_finish': task['earliest_finish'].isoformat(),
+                'slack': task['slack'],
+                'critical': task['critical'],
+                'depends_on': task['depends_on'],
+            }
+            for task_id, task in schedule['tasks'].items()
+        ],
+    })
+
+class TaskCreateView(TenantEditRequiredMixin, SuccessMessageMixin, CreateView):
     model = Task
-    fields = ['title', 'description', 'status', 'due_date']
+    form_class = TaskForm
     template_name = 'projects/task_form.html'
     success_message = "Task created successfully."
 
-    def form_valid(self, form):
-        project = get_object_or_404(Project, id=self.kwargs['project_id'], owner=self.request.user)
-        form.instance.project = project
-        return super().form_valid(form)
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['project'] = get_object_or_404(Project.objects.for_tenant(self.request.tenant), id=self.kwargs['project_id'])
+        return kwargs
 
     def get_success_url(self):
         return reverse_lazy('project_detail', kwargs={'pk': self.kwargs['project_id']})
 
-class TaskUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
+class TaskUpdateView(TenantEditRequiredMixin, SuccessMessageMixin, UpdateView):
     model = Task
-    fields = ['title', 'description', 'status', 'due_date']
+    form_class = TaskForm
     template_name = 'projects/task_form.html'
     success_message = "Task updated."
 
     def get_queryset(self):
-        return Task.objects.filter(project__owner=self.request.user)
+        return Task.objects.filter(project__organization=self.request.tenant).select_related('project')
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['project'] = self.object.project
+        return kwargs
 
     def get_success_url(self):
         return reverse_lazy('project_detail', kwargs={'pk': self.object.project.id})
 
-class TaskStatusUpdateView(LoginRequiredMixin, UpdateView):
+class TaskStatusUpdateView(TenantEditRequiredMixin, UpdateView):
     model = Task
     fields = ['status']
     
     def get_queryset(self):
-        return Task.objects.filter(project__owner=self.request.user)
+        return Task.objects.filter(project__organization=self.request.tenant)
 
     def get_success_url(self):
         return reverse_lazy('project_detail', kwargs={'pk': self.object.project.id})
 
-class TaskDeleteView(LoginRequiredMixin, DeleteView):
+class TaskDeleteView(TenantEditRequiredMixin, DeleteView):
     model = Task
     template_name = 'projects/task_confirm_delete.html'
 
     def get_queryset(self):
-        return Task.objects.filter(project__owner=self.request.user)
+        return Task.objects.filter(project__organization=self.request.tenant)
 
     def delete(self, request, *args, **kwargs):
         messages.success(self.request, "Task deleted.")
@@ -149,15 +238,15 @@ class TaskDeleteView(LoginRequiredMixin, DeleteView):
         return reverse_lazy('project_detail', kwargs={'pk': self.object.project.id})
 
 # Reminder Views
-class ReminderListView(LoginRequiredMixin, ListView):
+class ReminderListView(TenantRequiredMixin, ListView):
     model = Reminder
     template_name = 'projects/reminder_list.html'
     context_object_name = 'reminders'
 
     def get_queryset(self):
-        return Reminder.objects.filter(project__owner=self.request.user).select_related('project')
+        return Reminder.objects.filter(project__organization=self.request.tenant).select_related('project')
 
-class ReminderCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
+class ReminderCreateView(TenantEditRequiredMixin, SuccessMessageMixin, CreateView):
     model = Reminder
     fields = ['project', 'reminder_date', 'message']
     template_name = 'projects/reminder_form.html'
@@ -166,8 +255,106 @@ class ReminderCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
 
     def get_form(self, form_class=None):
         form = super().get_form(form_class)
-        form.fields['project'].queryset = Project.objects.filter(owner=self.request.user)
+        form.fields['project'].queryset = Project.objects.for_tenant(self.request.tenant)
         return form
 
 class SettingsView(LoginRequiredMixin, TemplateView):
     template_name = 'projects/settings.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        feed = CalendarFeed.for_user(self.request.user)
+        context['calendar_feed_url'] = self.request.build_absolute_uri(
+            reverse('calendar_feed', kwargs={'token': feed.token})
+        )
+        return context
+
+class CalendarFeedResetView(LoginRequiredMixin, View):
+    def post(self, request, *args, **kwargs):
+        CalendarFeed.for_user(request.user).regenerate_token()
+        messages.success(request, "Calendar link regenerated. Update your calendar subscription.")
+        return redirect('settings')
+
+def calendar_feed(request, token):
+    """
+    Token-authenticated iCalendar feed. The token and the feed's version are
+    cached, so polls with a matching ETag don't touch the database; unchanged
+    feeds are served from the cache.
+    """
+    owner_id = get_feed_owner_id(token)
+    if owner_id is None:
+        raise Http404("Unknown calendar feed.")
+    version = get_feed_version(owner_id, token)
+
+    etag = f'"{version}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    cache_key = f"ical:{owner_id}:{request.get_host()}:{version}"
+    body = cache.get(cache_key)
+    if body is not None:
+        response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+    else:
+        def project_url(project_id):
+            return request.build_absolute_uri(reverse('project_detail', kwargs={'pk': project_id}))
+
+        def stream():
+            chunks = []
+            for chunk in iter_calendar(owner_id, project_url):
+                chunks.append(chunk)
+                yield chunk
+            cache.set(cache_key, ''.join(chunks), CACHE_TIMEOUT)
+
+        response = StreamingHttpResponse(stream(), content_type='text/calendar; charset=utf-8')
+
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    response['Content-Disposition'] = 'inline; filename="dpl.ics"'
+    return response
+
+SSE_HEARTBEAT_SECONDS = 20
+
+async def event_stream(request):
+    """
+    Server-sent events feed of the active organization's project, task and
+    reminder changes, and of reminders as they come due (projects.reminders).
+    Needs the ASGI server; under WSGI it answers 204 so
+    browsers stop retrying.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    # Resolved by TenantMiddleware, so no database access on the event loop.
+    tenant = getattr(request, 'tenant', None)
+    if tenant is None:
+        return HttpResponse(status=204)
+
+    async def stream():
+        subscription = broker.subscribe(tenant.pk)
+        ensure_reminder_checks()
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(tenant.pk, subscription)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+def health_check(request):
+    """Liveness probe for load balancers and the pre-fork server (`manage.py serve`)."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return HttpResponse("database unavailable", status=503, content_type='text/plain')
+    return HttpResponse("ok", content_type='text/plain')
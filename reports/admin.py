@@ -1,3 +1,14 @@
 from django.contrib import admin
+from .models import ProjectForecast, ReportJob
 
-# Register your models here.
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ('organization', 'owner', 'kind', 'format', 'project', 'status', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind', 'format')
+    readonly_fields = ('key',)
+
+@admin.register(ProjectForecast)
+class ProjectForecastAdmin(admin.ModelAdmin):
+    list_display = ('project', 'organization', 'velocity', 'remaining_tasks', 'projected_finish', 'days_late', 'at_risk', 'computed_at')
+    list_filter = ('at_risk', 'organization')
+    list_select_related = ('project', 'organization')
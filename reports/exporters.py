@@ -0,0 +1,230 @@
+import hashlib
+import os
+from datetime import timedelta
+
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from projects.models import Project, Task
+
+# Bump when the layout of generated files changes so stored copies are rebuilt.
+GENERATOR_VERSION = 1
+
+
+def report_summary(organization):
+    """Metrics shared by the reports dashboard and the summary export."""
+    projects = Project.objects.for_tenant(organization)
+    completed_projects = projects.filter(status='COMPLETED')
+
+    # Performance Metrics
+    total_completed = completed_projects.count()
+    on_time_count = 0
+    overdue_count = 0
+
+    project_durations = []
+
+    for p in completed_projects:
+        if p.completed_at and p.deadline:
+            if p.completed_at.date() <= p.deadline:
+                on_time_count += 1
+            else:
+                overdue_count += 1
+
+        if p.completed_at and p.start_date:
+            duration = (p.completed_at.date() - p.start_date).days
+            project_durations.append(duration)
+
+    avg_duration = sum(project_durations) / len(project_durations) if project_durations else 0
+
+    # Status Distribution
+    status_data = list(projects.values('status').annotate(count=Count('id')))
+
+    # Monthly Completion Trends (Last 6 months)
+    today = timezone.now().date()
+    months = []
+    completion_trends = []
+    for i in range(5, -1, -1):
+        first_day_of_month = (today.replace(day=1) - timedelta(days=i*30)).replace(day=1)
+        next_month = (first_day_of_month + timedelta(days=32)).replace(day=1)
+        count = completed_projects.filter(completed_at__range=[first_day_of_month, next_month]).count()
+        months.append(first_day_of_month.strftime('%b %Y'))
+        completion_trends.append(count)
+
+    return {
+        'projects': projects,
+        'completed_projects': completed_projects,
+        'total_projects': projects.count(),
+        'completed_count': total_completed,
+        'on_time_count': on_time_count,
+        'overdue_count': overdue_count,
+        'avg_duration': round(avg_duration, 1),
+        'status_labels': [s['status'] for s in status_data],
+        'status_values': [s['count'] for s in status_data],
+        'trend_labels': months,
+        'trend_values': completion_trends,
+    }
+
+
+def data_version(kind, fmt, organization, project=None):
+    """
+    Content address for a report: the report type and format plus the latest
+    updated_at and row count of its inputs (counts catch deletes). The summary
+    also depends on today's date through its monthly trend.
+    """
+    parts = [str(GENERATOR_VERSION), kind, fmt, str(organization.pk)]
+    if kind == 'TASKS':
+        tasks = Task.objects.filter(project=project).aggregate(latest=Max('updated_at'), count=Count('id'))
+        parts += [str(project.pk), project.updated_at.isoformat(), str(tasks['latest']), str(tasks['count'])]
+    else:
+        projects = Project.objects.for_tenant(organization).aggregate(latest=Max('updated_at'), count=Count('id'))
+        parts += [str(projects['latest']), str(projects['count'])]
+        if kind == 'SUMMARY':
+            parts.append(str(timezone.now().date()))
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+
+def _summary_sections(organization):
+    summary = report_summary(organization)
+    yield 'Performance', ['Metric', 'Value'], [
+        ['Total projects', summary['total_projects']],
+        ['Completed', summary['completed_count']],
+        ['Completed on time', summary['on_time_count']],
+        ['Completed after deadline', summary['overdue_count']],
+        ['Average duration (days)', summary['avg_duration']],
+    ]
+    yield 'Status Distribution', ['Status', 'Projects'], zip(summary['status_labels'], summary['status_values'])
+    yield 'Monthly Completions', ['Month', 'Completed'], zip(summary['trend_labels'], summary['trend_values'])
+
+
+def _completed_sections(organization):
+    projects = Project.objects.for_tenant(organization).filter(status='COMPLETED').order_by('-completed_at')
+    rows = (
+        [
+            p.name,
+            p.client or 'N/A',
+            p.start_date,
+            p.deadline,
+            p.completed_at.strftime('%Y-%m-%d %H:%M') if p.completed_at else 'N/A',
+            p.status,
+            f"{p.progress}%",
+        ]
+        for p in projects.iterator(chunk_size=500)
+    )
+    yield 'Completed Projects', ['Project Name', 'Client', 'Start Date', 'Deadline', 'Completed At', 'Status', 'Progress'], rows
+
+
+def _task_sections(project):
+    yield 'Project', ['Field', 'Value'], [
+        ['Name', project.name],
+        ['Client', project.client or 'N/A'],
+        ['Timeline', f"{project.start_date} - {project.deadline}"],
+        ['Status', project.get_status_display()],
+        ['Progress', f"{project.progress:.0f}%"],
+    ]
+    tasks = Task.objects.filter(project=project).order_by('due_date', 'pk')
+    rows = (
+        [t.title, t.get_status_display(), t.due_date or '-', t.description or '']
+        for t in tasks.iterator(chunk_size=500)
+    )
+    yield 'Tasks', ['Task', 'Status', 'Due Date', 'Description'], rows
+
+
+def build_sections(job):
+    if job.kind == 'SUMMARY':
+        return 'Project Reports Summary', _summary_sections(job.organization)
+    if job.kind == 'COMPLETED':
+        return 'Completed Projects Report', _completed_sections(job.organization)
+    return f"Task Sheet: {job.project.name}", _task_sections(job.project)
+
+
+def write_xlsx(path, title, sections):
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+    except ImportError:
+        raise RuntimeError("Excel exports need the 'openpyxl' package.")
+
+    workbook = Workbook(write_only=True)
+    bold = Font(bold=True)
+    for heading, headers, rows in sections:
+        sheet = workbook.create_sheet(title=heading[:31])
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(sheet, value=header)
+            cell.font = bold
+            header_cells.append(cell)
+        sheet.append(header_cells)
+        for row in rows:
+            sheet.append(list(row))
+    workbook.save(path)
+
+
+def write_pdf(path, title, sections):
+    try:
+        import pymupdf
+    except ImportError:
+        raise RuntimeError("PDF exports need the 'PyMuPDF' package.")
+
+    width, height, margin = 842, 595, 40  # A4 landscape, in points
+    line_height, font_size = 14, 9
+    document = pymupdf.open()
+    state = {'page': None, 'y': height}
+
+    def fit(text, column_width, font):
+        # Rough cut first so long descriptions don't take many measuring passes.
+        text = str(text).replace('\n', ' ')[:int(column_width / 3)]
+        while text and pymupdf.get_text_length(text, fontname=font, fontsize=font_size) > column_width - 6:
+            text = text[:-4] + '...' if len(text) > 3 else ''
+        return text
+
+    def ensure_space(lines=1):
+        if state['page'] is None or state['y'] + line_height * lines > height - margin:
+            state['page'] = document.new_page(width=width, height=height)
+            state['y'] = margin
+
+    def write_row(values, column_width, font='helv'):
+        ensure_space()
+        for index, value in enumerate(values):
+            state['page'].insert_text(
+                (margin + index * column_width, state['y']),
+                fit('' if value is None else value, column_width, font),
+                fontname=font, fontsize=font_size,
+            )
+        state['y'] += line_height
+
+    ensure_space()
+    state['page'].insert_text((margin, state['y']), title, fontname='hebo', fontsize=16)
+    state['y'] += line_height * 2
+    for heading, headers, rows in sections:
+        column_width = (width - 2 * margin) / len(headers)
+        ensure_space(3)
+        state['page'].insert_text((margin, state['y']), heading, fontname='hebo', fontsize=12)
+        state['y'] += line_height * 1.5
+        write_row(headers, column_width, font='hebo')
+        for row in rows:
+            write_row(row, column_width)
+        state['y'] += line_height
+
+    document.save(path)
+    document.close()
+
+
+WRITERS = {
+    'pdf': write_pdf,
+    'xlsx': write_xlsx,
+}
+
+
+def generate_report(job):
+    """Builds the job's file atomically at job.file_path."""
+    path = job.file_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    title, sections = build_sections(job)
+    try:
+        WRITERS[job.format](str(tmp_path), title, sections)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
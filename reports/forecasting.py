@@ -0,0 +1,177 @@
+"""
+Completion forecasts for every in-flight project, computed in one batch.
+
+Recent task completions are loaded as flat columns and a velocity (tasks done
+per day, exponentially weighted towards recent weeks) is fitted for all
+projects at once with NumPy array operations, not a Python loop per project.
+The results are upserted into ProjectForecast for pages to join against.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from projects.models import Project, Task
+from .models import ProjectForecast
+
+ACTIVE_STATUSES = ['NOT_STARTED', 'IN_PROGRESS', 'ON_HOLD']
+# Completions older than this don't count towards velocity.
+HISTORY_DAYS = 90
+# A completion this many days ago weighs half as much as one today.
+HALF_LIFE_DAYS = 14
+# Projects with no recent completions are flagged once the deadline is this close.
+STALLED_WARNING_DAYS = 14
+# Finishes further out than this aren't projected (dates past 9999 can't be
+# stored); such projects are flagged at risk instead.
+HORIZON_DAYS = 5 * 365
+BATCH_SIZE = 1000
+
+
+def _day_numbers(np, dates):
+    return np.array(dates, dtype='datetime64[D]').astype(np.int64)
+
+
+def _positions(np, ids, values):
+    """Index of each value in the sorted `ids`, and a mask of the values found there."""
+    values = np.array(values, dtype=np.int64)
+    positions = np.minimum(np.searchsorted(ids, values), max(len(ids) - 1, 0))
+    found = ids[positions] == values if len(ids) else np.zeros(len(values), dtype=bool)
+    return positions, found
+
+
+def load_columns(np, today):
+    """Active projects and their recent completions as parallel arrays, ordered by project id."""
+    projects = list(
+        Project.objects.filter(status__in=ACTIVE_STATUSES).order_by('pk')
+        .values_list('pk', 'organization_id', 'start_date', 'deadline')
+    )
+    ids, organizations, starts, deadlines = zip(*projects) if projects else ((), (), (), ())
+
+    counts = list(
+        Task.objects.filter(project__status__in=ACTIVE_STATUSES)
+        .values_list('project_id')
+        .annotate(total=Count('pk'), done=Count('pk', filter=Q(status='DONE')))
+        .order_by()
+    )
+    count_ids, totals, done = zip(*counts) if counts else ((), (), ())
+
+    completions = list(
+        Task.objects.filter(
+            project__status__in=ACTIVE_STATUSES,
+            status='DONE',
+            completed_at__date__gte=today - timedelta(days=HISTORY_DAYS),
+        ).order_by().values_list('project_id', TruncDate('completed_at'))
+    )
+    completed_ids, completed_days = zip(*completions) if completions else ((), ())
+
+    # The queries aren't one snapshot; rows of projects that changed status in
+    # between are dropped.
+    ids = np.array(ids, dtype=np.int64)
+    total_tasks = np.zeros(len(ids), dtype=np.int64)
+    done_tasks = np.zeros(len(ids), dtype=np.int64)
+    positions, found = _positions(np, ids, count_ids)
+    total_tasks[positions[found]] = np.array(totals, dtype=np.int64)[found]
+    done_tasks[positions[found]] = np.array(done, dtype=np.int64)[found]
+    completed_positions, completed_found = _positions(np, ids, completed_ids)
+
+    return {
+        'id': ids,
+        'organization': np.array(organizations, dtype=np.int64),
+        'start': _day_numbers(np, starts),
+        'deadline': _day_numbers(np, deadlines),
+        'total': total_tasks,
+        'done': done_tasks,
+        'completed_project': completed_positions[completed_found],
+        'completed_day': _day_numbers(np, completed_days)[completed_found],
+    }
+
+
+def fit_forecasts(np, columns, today):
+    """
+    Velocity per project is the decay-weighted count of completions divided
+    by the weighted number of days the project has been running within the
+    history window; the remaining tasks are then spread over that rate.
+    """
+    today = _day_numbers(np, [today])[0]
+    count = len(columns['id'])
+    decay = 0.5 ** (1 / HALF_LIFE_DAYS)
+
+    ages = np.maximum(today - columns['completed_day'], 0)
+    weighted_done = np.bincount(columns['completed_project'], weights=decay ** ages, minlength=count)
+    observed_days = np.clip(today - columns['start'] + 1, 1, HISTORY_DAYS)
+    exposure = (1 - decay ** observed_days) / (1 - decay)
+    velocity = weighted_done / exposure
+
+    remaining = columns['total'] - columns['done']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_needed = np.where(remaining > 0, np.ceil(remaining / velocity), 0)
+    measured = np.isfinite(days_needed)
+    beyond_horizon = measured & (days_needed > HORIZON_DAYS)
+    projectable = measured & ~beyond_horizon & (columns['total'] > 0)
+    work_start = np.maximum(columns['start'], today)
+    projected = np.where(projectable, work_start + np.where(projectable, days_needed, 0), 0).astype(np.int64)
+    days_late = np.where(projectable, projected - columns['deadline'], 0)
+
+    stalled = ~measured & (remaining > 0) & (columns['deadline'] - today <= STALLED_WARNING_DAYS)
+    at_risk = (remaining > 0) & ((projectable & (days_late > 0)) | stalled | beyond_horizon)
+
+    return {
+        'velocity': velocity,
+        'remaining': remaining,
+        'projected': projected.astype('datetime64[D]'),
+        'projectable': projectable,
+        'days_late': days_late,
+        'at_risk': at_risk,
+    }
+
+
+def refresh_forecasts(today=None, batch_size=BATCH_SIZE):
+    """Recomputes and stores forecasts for all active projects. Returns how many."""
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("Forecasting needs the 'numpy' package.")
+
+    now = timezone.now()
+    today = today or timezone.localdate(now)
+    columns = load_columns(np, today)
+    fitted = fit_forecasts(np, columns, today)
+
+    forecasts = [
+        ProjectForecast(
+            project_id=project_id,
+            organization_id=organization_id,
+            velocity=round(velocity, 4),
+            remaining_tasks=remaining,
+            projected_finish=projected if projectable else None,
+            days_late=days_late,
+            at_risk=at_risk,
+            computed_at=now,
+        )
+        for project_id, organization_id, velocity, remaining, projected, projectable, days_late, at_risk in zip(
+            columns['id'].tolist(),
+            columns['organization'].tolist(),
+            fitted['velocity'].tolist(),
+            fitted['remaining'].tolist(),
+            fitted['projected'].tolist(),
+            fitted['projectable'].tolist(),
+            fitted['days_late'].tolist(),
+            fitted['at_risk'].tolist(),
+        )
+    ]
+    with transaction.atomic():
+        ProjectForecast.objects.exclude(project__status__in=ACTIVE_STATUSES).delete()
+        ProjectForecast.objects.bulk_create(
+            forecasts,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['project'],
+            update_fields=[
+                'organization', 'velocity', 'remaining_tasks', 'projected_finish',
+                'days_late', 'at_risk', 'computed_at',
+            ],
+        )
+    return len(forecasts)
@@ -0,0 +1,147 @@
+"""
+Background execution of report exports.
+
+Jobs live in the ReportJob table. They are claimed with a conditional UPDATE,
+so the in-process thread pool and any number of `run_report_worker` processes
+can share the queue without running a job twice.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+from dpl_core.routers import read_replica
+from .exporters import data_version, generate_report
+from .models import ReportJob
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+# Jobs the in-process pool is running right now.
+_running = set()
+_running_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.REPORT_WORKER_THREADS, thread_name_prefix='report-job'
+        )
+    return _executor
+
+
+def drain(timeout=None):
+    """
+    Stops the in-process pool before a server worker process exits. Running
+    jobs get up to `timeout` seconds to finish; jobs still running after that
+    are put back to PENDING for `run_report_worker` or a later request, and
+    queued ones stay PENDING.
+    """
+    global _executor
+    if _executor is None:
+        return
+    executor, _executor = _executor, None
+    executor.shutdown(wait=False, cancel_futures=True)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while _running and (deadline is None or time.monotonic() < deadline):
+        time.sleep(0.1)
+    with _running_lock:
+        abandoned = list(_running)
+    if abandoned:
+        logger.warning("Requeueing report jobs %s abandoned at exit", abandoned)
+        ReportJob.objects.filter(pk__in=abandoned, status='RUNNING').update(status='PENDING', started_at=None)
+
+
+def request_report(user, organization, kind, fmt, project=None):
+    """
+    Returns the job for the current version of the organization's report,
+    creating and queueing it if the report has not been generated for this
+    data yet.
+    """
+    with read_replica():
+        key = data_version(kind, fmt, organization, project)
+    job, created = ReportJob.objects.get_or_create(
+        key=key,
+        defaults={'organization': organization, 'owner': user, 'kind': kind, 'format': fmt, 'project': project},
+    )
+    if not created and (
+        job.status == 'FAILED'
+        or job.status == 'DONE' and not job.file_path.exists()
+        or is_stale(job)
+    ):
+        # Retry failures, jobs lost by a crashed process and stored files
+        # that have been removed.
+        ReportJob.objects.filter(pk=job.pk).update(status='PENDING', error='', started_at=None, finished_at=None)
+        job.status = 'PENDING'
+        created = True
+    if created:
+        enqueue(job)
+    return job
+
+
+def is_stale(job):
+    if job.status not in ('PENDING', 'RUNNING'):
+        return False
+    cutoff = timezone.now() - timedelta(seconds=settings.REPORT_JOB_STALE_AFTER)
+    return (job.started_at or job.created_at) < cutoff
+
+
+def enqueue(job):
+    if settings.REPORT_WORKER_THREADS > 0:
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_pool, job.pk))
+
+
+def _run_in_pool(job_id):
+    with _running_lock:
+        _running.add(job_id)
+    try:
+        run_job(job_id)
+    finally:
+        with _running_lock:
+            _running.discard(job_id)
+
+
+def claim(job_id):
+    return ReportJob.objects.filter(pk=job_id, status='PENDING').update(
+        status='RUNNING', started_at=timezone.now()
+    ) == 1
+
+
+def run_job(job_id):
+    """Runs one queued job. Safe to call from any thread or process."""
+    close_old_connections()
+    try:
+        if not claim(job_id):
+            return
+        job = ReportJob.objects.select_related('organization', 'project').get(pk=job_id)
+        try:
+            with read_replica():
+                generate_report(job)
+        except Exception as exc:
+            logger.exception("Report job %s failed", job_id)
+            ReportJob.objects.filter(pk=job_id).update(
+                status='FAILED', error=str(exc), finished_at=timezone.now()
+            )
+            return
+        ReportJob.objects.filter(pk=job_id).update(status='DONE', finished_at=timezone.now())
+        _remove_superseded(job)
+    finally:
+        connections.close_all()
+
+
+def _remove_superseded(job):
+    """Older versions of the same report are no longer reachable; drop them."""
+    older = ReportJob.objects.filter(
+        organization=job.organization_id, kind=job.kind, format=job.format, project=job.project_id,
+        status__in=['DONE', 'FAILED'], created_at__lt=job.created_at,
+    )
+    for old_job in older:
+        old_job.file_path.unlink(missing_ok=True)
+    older.delete()
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.forecasting import BATCH_SIZE, refresh_forecasts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute completion forecasts and at-risk flags for all active "
+        "projects. Run nightly, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            count = refresh_forecasts(batch_size=options['batch_size'])
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f"Forecast {count} projects in {time.monotonic() - started:.2f}s."
+        ))
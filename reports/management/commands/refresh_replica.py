@@ -0,0 +1,51 @@
+import os
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from dpl_core.routers import get_replica_alias, get_replica_path
+
+
+class Command(BaseCommand):
+    help = "Refresh the SQLite read replica used by reports from the primary database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--if-older-than', type=int, metavar='SECONDS',
+            help="Only refresh when the current copy is older than this.",
+        )
+
+    def handle(self, *args, **options):
+        path = get_replica_path()
+        if get_replica_alias() is None or not path:
+            raise CommandError("No SQLite read replica is configured (READ_REPLICA_SQLITE_PATH).")
+
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError("The primary database is not SQLite; use the server's own replication.")
+
+        max_age = options['if_older_than']
+        if max_age is not None and os.path.exists(path):
+            age = time.time() - os.path.getmtime(path)
+            if age < max_age:
+                self.stdout.write(f"Replica is {age:.0f}s old; nothing to do.")
+                return
+
+        # Copy into a temporary file and swap it in atomically so readers never
+        # see a half-written database.
+        tmp_path = f"{path}.tmp"
+        started = time.monotonic()
+        primary.ensure_connection()
+        target = sqlite3.connect(tmp_path)
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
+        os.replace(tmp_path, path)
+        connections[get_replica_alias()].close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Replica refreshed in {time.monotonic() - started:.2f}s."
+        ))
@@ -0,0 +1,38 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reports.jobs import run_job
+from reports.models import ReportJob
+
+
+class Command(BaseCommand):
+    help = "Process queued PDF/Excel report jobs outside the web server."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the queue once and exit.")
+        parser.add_argument('--poll-interval', type=float, default=2.0)
+        parser.add_argument(
+            '--stale-after', type=int, default=settings.REPORT_JOB_STALE_AFTER, metavar='SECONDS',
+            help="Requeue jobs stuck in RUNNING this long (e.g. after a crash).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            stale = timezone.now() - timedelta(seconds=options['stale_after'])
+            ReportJob.objects.filter(status='RUNNING', started_at__lt=stale).update(status='PENDING')
+
+            job_ids = list(
+                ReportJob.objects.filter(status='PENDING').order_by('created_at').values_list('pk', flat=True)[:20]
+            )
+            for job_id in job_ids:
+                run_job(job_id)
+                self.stdout.write(f"Processed report job {job_id}.")
+
+            if options['once'] and not job_ids:
+                return
+            if not job_ids:
+                time.sleep(options['poll_interval'])
@@ -0,0 +1,58 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_personal_organizations(apps, schema_editor):
+    """Existing report jobs move into their owner's personal organization."""
+    Membership = apps.get_model('teams', 'Membership')
+    ReportJob = apps.get_model('reports', 'ReportJob')
+
+    personal = {}
+    for user_id, organization_id in Membership.objects.filter(role='OWNER').order_by(
+        '-created_at', '-pk'
+    ).values_list('user_id', 'organization_id'):
+        personal[user_id] = organization_id  # oldest owned organization wins
+    owner_ids = ReportJob.objects.filter(organization__isnull=True).values_list('owner_id', flat=True).distinct()
+    for owner_id in list(owner_ids):
+        ReportJob.objects.filter(owner_id=owner_id, organization__isnull=True).update(
+            organization_id=personal[owner_id]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_organization'),
+        ('reports', '0001_initial'),
+        ('teams', '0002_personal_organizations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reportjob',
+            name='reports_rep_owner_i_c80614_idx',
+        ),
+        migrations.AddField(
+            model_name='reportjob',
+            name='organization',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='report_jobs', to='teams.organization'),
+        ),
+        migrations.AddIndex(
+            model_name='reportjob',
+            index=models.Index(fields=['organization', 'kind', 'format', 'project'], name='reports_rep_organiz_049729_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportjob',
+            index=models.Index(fields=['organization', 'created_at'], name='reports_rep_organiz_ad5165_idx'),
+        ),
+        migrations.RunPython(assign_personal_organizations, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='reportjob',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_jobs', to='teams.organization'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-19 21:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_task_completed_at'),
+        ('reports', '0002_reportjob_organization'),
+        ('teams', '0002_personal_organizations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectForecast',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='forecast', serialize=False, to='projects.project')),
+                ('velocity', models.FloatField()),
+                ('remaining_tasks', models.PositiveIntegerField()),
+                ('projected_finish', models.DateField(blank=True, null=True)),
+                ('days_late', models.IntegerField(default=0)),
+                ('at_risk', models.BooleanField(default=False)),
+                ('computed_at', models.DateTimeField()),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_forecasts', to='teams.organization')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organization', 'at_risk'], name='reports_pro_organiz_244375_idx')],
+            },
+        ),
+    ]
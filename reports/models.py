@@ -1,3 +1,93 @@
+from django.conf import settings
 from django.db import models
+from django.contrib.auth.models import User
 
-# Create your models here.
+from projects.models import Project
+from teams.models import Organization, TenantManager
+
+class ReportJob(models.Model):
+    KIND_CHOICES = [
+        ('SUMMARY', 'Reports Summary'),
+        ('COMPLETED', 'Completed Projects'),
+        ('TASKS', 'Project Task Sheet'),
+    ]
+    FORMAT_CHOICES = [
+        ('pdf', 'PDF'),
+        ('xlsx', 'Excel'),
+    ]
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='report_jobs')
+    # Who first requested this version; members of the organization share it.
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='report_jobs')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, blank=True, null=True, related_name='report_jobs')
+    # Content address: hash of the report type and the version of its input
+    # data, so an unchanged report maps to the same stored file.
+    key = models.CharField(max_length=64, unique=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = TenantManager()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['organization', 'kind', 'format', 'project']),
+            models.Index(fields=['organization', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} ({self.format}) for {self.organization.name}"
+
+    @property
+    def file_path(self):
+        return settings.REPORTS_ROOT / f"{self.key}.{self.format}"
+
+    @property
+    def filename(self):
+        name = self.get_kind_display().lower().replace(' ', '_')
+        if self.project_id:
+            name = f"{name}_{self.project_id}"
+        return f"{name}.{self.format}"
+
+    @property
+    def is_ready(self):
+        return self.status == 'DONE' and self.file_path.exists()
+
+class ProjectForecast(models.Model):
+    """
+    Projected finish of an active project, refreshed in bulk by the nightly
+    `forecast_projects` command so pages only join this table.
+    """
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='forecast')
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='project_forecasts')
+    # Recent tasks done per day, weighted towards the last few weeks.
+    velocity = models.FloatField()
+    remaining_tasks = models.PositiveIntegerField()
+    # Null when nothing has been completed recently to project from.
+    projected_finish = models.DateField(null=True, blank=True)
+    days_late = models.IntegerField(default=0)
+    at_risk = models.BooleanField(default=False)
+    computed_at = models.DateTimeField()
+
+    objects = TenantManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organization', 'at_risk']),
+        ]
+
+    def __str__(self):
+        return f"Forecast for {self.project.name}"
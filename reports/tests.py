@@ -1,3 +1,217 @@
-from django.test import TestCase
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import skipIf
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from projects.models import Project, Task
+from teams.models import Organization
+from .forecasting import HALF_LIFE_DAYS, HORIZON_DAYS, _day_numbers, _positions, fit_forecasts, refresh_forecasts
+from .models import ProjectForecast, ReportJob
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@skipIf(numpy is None, "Forecasting needs numpy.")
+class PositionsTests(SimpleTestCase):
+    def test_found_and_missing_values(self):
+        ids = numpy.array([2, 5, 9], dtype=numpy.int64)
+        positions, found = _positions(numpy, ids, [5, 1, 9, 10])
+        self.assertEqual(found.tolist(), [True, False, True, False])
+        self.assertEqual(positions[found].tolist(), [1, 2])
+
+    def test_no_ids(self):
+        positions, found = _positions(numpy, numpy.array([], dtype=numpy.int64), [3, 4])
+        self.assertEqual(found.tolist(), [False, False])
+        self.assertEqual(len(positions[found]), 0)
+
+
+@skipIf(numpy is None, "Forecasting needs numpy.")
+class FitForecastsTests(SimpleTestCase):
+    today = date(2026, 3, 2)
+
+    def columns(self, projects, completions):
+        """projects: (start, deadline, total, done); completions: (project index, day)."""
+        return {
+            'id': numpy.arange(1, len(projects) + 1, dtype=numpy.int64),
+            'organization': numpy.ones(len(projects), dtype=numpy.int64),
+            'start': _day_numbers(numpy, [p[0] for p in projects]),
+            'deadline': _day_numbers(numpy, [p[1] for p in projects]),
+            'total': numpy.array([p[2] for p in projects], dtype=numpy.int64),
+            'done': numpy.array([p[3] for p in projects], dtype=numpy.int64),
+            'completed_project': numpy.array([c[0] for c in completions], dtype=numpy.int64),
+            'completed_day': _day_numbers(numpy, [c[1] for c in completions]),
+        }
+
+    def test_recent_completions_weigh_more(self):
+        start = self.today - timedelta(days=60)
+        deadline = self.today + timedelta(days=60)
+        fitted = fit_forecasts(numpy, self.columns(
+            [(start, deadline, 5, 1), (start, deadline, 5, 1)],
+            [(0, self.today), (1, self.today - timedelta(days=HALF_LIFE_DAYS))],
+        ), self.today)
+        velocity = fitted['velocity'].tolist()
+        self.assertAlmostEqual(velocity[1], velocity[0] / 2)
+
+    def test_late_and_on_time(self):
+        start = self.today - timedelta(days=9)
+        completions = [(0, self.today - timedelta(days=day)) for day in range(10)]
+        completions += [(1, self.today - timedelta(days=day)) for day in range(10)]
+        fitted = fit_forecasts(numpy, self.columns([
+            # One task a day for ten days: the 5 left fit in 10 days but not in 2.
+            (start, self.today + timedelta(days=10), 15, 10),
+            (start, self.today + timedelta(days=2), 15, 10),
+        ], completions), self.today)
+
+        self.assertEqual(fitted['velocity'].tolist(), [1.0, 1.0])
+        self.assertEqual(fitted['projected'].tolist(), [self.today + timedelta(days=5)] * 2)
+        self.assertEqual(fitted['days_late'].tolist(), [-5, 3])
+        self.assertEqual(fitted['at_risk'].tolist(), [False, True])
+
+    def test_finish_beyond_horizon_is_at_risk(self):
+        start = self.today - timedelta(days=89)
+        fitted = fit_forecasts(numpy, self.columns([
+            (start, self.today + timedelta(days=HORIZON_DAYS * 2), 3001, 1),
+        ], [(0, self.today - timedelta(days=89))]), self.today)
+
+        self.assertGreater(3000 / fitted['velocity'][0], HORIZON_DAYS)
+        self.assertEqual(fitted['projectable'].tolist(), [False])
+        self.assertEqual(fitted['days_late'].tolist(), [0])
+        self.assertEqual(fitted['at_risk'].tolist(), [True])
+        # Every entry stays a date so the rows can be saved.
+        self.assertIsInstance(fitted['projected'].tolist()[0], date)
+
+
+@skipIf(numpy is None, "Forecasting needs numpy.")
+class RefreshForecastsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('forecaster', password='pw')
+        self.organization = Organization.create_personal(self.user)
+        self.now = timezone.now()
+        self.today = timezone.localdate(self.now)
+
+    def make_project(self, name, deadline_in, done_days_ago=(), todo=0):
+        project = Project.objects.create(
+            organization=self.organization, owner=self.user, name=name, status='IN_PROGRESS',
+            start_date=self.today - timedelta(days=30), deadline=self.today + timedelta(days=deadline_in),
+        )
+        for days_ago in done_days_ago:
+            task = Task.objects.create(project=project, title='done', status='DONE')
+            Task.objects.filter(pk=task.pk).update(completed_at=self.now - timedelta(days=days_ago))
+        for _ in range(todo):
+            Task.objects.create(project=project, title='todo')
+        return project
+
+    def forecast(self, project):
+        return ProjectForecast.objects.get(project=project)
+
+    def test_project_without_tasks(self):
+        project = self.make_project('Empty', deadline_in=3)
+        refresh_forecasts(today=self.today)
+
+        forecast = self.forecast(project)
+        self.assertEqual(forecast.remaining_tasks, 0)
+        self.assertEqual(forecast.velocity, 0)
+        self.assertIsNone(forecast.projected_finish)
+        self.assertFalse(forecast.at_risk)
+
+    def test_stalled_project_flagged_near_deadline(self):
+        near = self.make_project('Near', deadline_in=7, done_days_ago=[120], todo=3)
+        far = self.make_project('Far', deadline_in=60, done_days_ago=[120], todo=3)
+        refresh_forecasts(today=self.today)
+
+        for project, at_risk in ((near, True), (far, False)):
+            forecast = self.forecast(project)
+            self.assertEqual(forecast.velocity, 0)
+            self.assertEqual(forecast.remaining_tasks, 3)
+            self.assertIsNone(forecast.projected_finish)
+            self.assertEqual(forecast.at_risk, at_risk)
+
+    def test_late_and_on_time_projects(self):
+        on_time = self.make_project('On time', deadline_in=30, done_days_ago=range(0, 20, 2), todo=2)
+        late = self.make_project('Late', deadline_in=5, done_days_ago=[25], todo=20)
+        refresh_forecasts(today=self.today)
+
+        forecast = self.forecast(on_time)
+        self.assertLessEqual(forecast.projected_finish, on_time.deadline)
+        self.assertLessEqual(forecast.days_late, 0)
+        self.assertFalse(forecast.at_risk)
+
+        forecast = self.forecast(late)
+        self.assertGreater(forecast.projected_finish, late.deadline)
+        self.assertEqual(forecast.days_late, (forecast.projected_finish - late.deadline).days)
+        self.assertTrue(forecast.at_risk)
+
+    def test_finish_beyond_horizon_still_saves(self):
+        project = self.make_project('Endless', deadline_in=60, done_days_ago=[85])
+        Task.objects.bulk_create(Task(project=project, title='todo') for _ in range(3000))
+        project.update_progress()
+        refresh_forecasts(today=self.today)
+
+        forecast = self.forecast(project)
+        self.assertIsNone(forecast.projected_finish)
+        self.assertTrue(forecast.at_risk)
+
+    def test_upsert_updates_and_drops_inactive_projects(self):
+        kept = self.make_project('Kept', deadline_in=30, done_days_ago=[1], todo=1)
+        closed = self.make_project('Closed', deadline_in=30, done_days_ago=[1], todo=1)
+        self.assertEqual(refresh_forecasts(today=self.today), 2)
+
+        Task.objects.create(project=kept, title='todo')
+        Project.objects.filter(pk=closed.pk).update(status='CANCELLED')
+        self.assertEqual(refresh_forecasts(today=self.today), 1)
+
+        self.assertEqual(list(ProjectForecast.objects.values_list('project', flat=True)), [kept.pk])
+        self.assertEqual(self.forecast(kept).remaining_tasks, 2)
+
+
+class ReportJobTenancyTests(TestCase):
+    def setUp(self):
+        # Cached memberships are keyed by user id, which tests reuse.
+        cache.clear()
+        reports_root = tempfile.TemporaryDirectory()
+        self.addCleanup(reports_root.cleanup)
+        settings_override = override_settings(REPORTS_ROOT=Path(reports_root.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.member = User.objects.create_user('member', password='pw')
+        self.job = self.make_job(self.member, 'ours')
+        outsider = User.objects.create_user('outsider', password='pw')
+        self.foreign_job = self.make_job(outsider, 'theirs')
+        self.foreign_project = Project.objects.create(
+            organization=outsider.organizations.get(), owner=outsider, name='Theirs', deadline=date(2026, 6, 1),
+        )
+        self.client.force_login(self.member)
+
+    def make_job(self, user, key):
+        job = ReportJob.objects.create(
+            organization=user.organizations.get(), owner=user, kind='SUMMARY', format='pdf', key=key, status='DONE',
+        )
+        job.file_path.write_bytes(b'%PDF')
+        return job
+
+    def test_other_organizations_jobs_are_not_found(self):
+        for name in ['report_job_status', 'report_job_download']:
+            with self.subTest(name):
+                self.assertEqual(self.client.get(reverse(name, args=[self.job.pk])).status_code, 200)
+                self.assertEqual(self.client.get(reverse(name, args=[self.foreign_job.pk])).status_code, 404)
+
+    def test_cannot_export_another_organizations_project(self):
+        response = self.client.post(reverse('generate_report'), {
+            'kind': 'TASKS', 'format': 'pdf', 'project': self.foreign_project.pk,
+        })
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(ReportJob.objects.filter(project=self.foreign_project).exists())
+
+    def test_dashboard_only_lists_the_active_organizations_jobs(self):
+        response = self.client.get(reverse('reports_dashboard'))
+        self.assertEqual(list(response.context['report_jobs']), [self.job])
@@ -4,4 +4,7 @@ from . import views
 urlpatterns = [
     path('dashboard/', views.reports_dashboard, name='reports_dashboard'),
     path('export/csv/', views.export_projects_csv, name='export_projects_csv'),
+    path('export/', views.generate_report, name='generate_report'),
+    path('export/jobs/<int:pk>/', views.report_job_status, name='report_job_status'),
+    path('export/jobs/<int:pk>/download/', views.report_job_download, name='report_job_download'),
 ]
@@ -1,75 +1,53 @@
-from django.shortcuts import render
-from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse
-from projects.models import Project, Task
-from django.db.models import Count, Q, Avg, F
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib import messages
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse, FileResponse, Http404, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_POST
+from projects.models import Project
+from dpl_core.routers import use_read_replica
+from teams.mixins import tenant_required
+from .exporters import report_summary
+from .jobs import request_report
+from .models import ProjectForecast, ReportJob
 import csv
 import json
-from django.utils import timezone
-from datetime import timedelta
 
-@login_required
+@tenant_required
+@use_read_replica
 def reports_dashboard(request):
-    user = request.user
-    projects = Project.objects.filter(owner=user)
-    completed_projects = projects.filter(status='COMPLETED')
-    
-    # Performance Metrics
-    total_completed = completed_projects.count()
-    on_time_count = 0
-    overdue_count = 0
-    
-    project_durations = []
-    
-    for p in completed_projects:
-        if p.completed_at and p.deadline:
-            if p.completed_at.date() <= p.deadline:
-                on_time_count += 1
-            else:
-                overdue_count += 1
-        
-        if p.completed_at and p.start_date:
-            duration = (p.completed_at.date() - p.start_date).days
-            project_durations.append(duration)
-
-    avg_duration = sum(project_durations) / len(project_durations) if project_durations else 0
-
-    # Data for Charts
-    # 1. Status Distribution
-    status_data = list(projects.values('status').annotate(count=Count('id')))
-    status_labels = [s['status'] for s in status_data]
-    status_values = [s['count'] for s in status_data]
-
-    # 2. Monthly Completion Trends (Last 6 months)
-    today = timezone.now().date()
-    months = []
-    completion_trends = []
-    for i in range(5, -1, -1):
-        first_day_of_month = (today.replace(day=1) - timedelta(days=i*30)).replace(day=1)
-        next_month = (first_day_of_month + timedelta(days=32)).replace(day=1)
-        count = completed_projects.filter(completed_at__range=[first_day_of_month, next_month]).count()
-        months.append(first_day_of_month.strftime('%b %Y'))
-        completion_trends.append(count)
+    summary = report_summary(request.tenant)
+    completed_projects = summary['completed_projects']
 
     context = {
-        'total_projects': projects.count(),
-        'completed_count': total_completed,
-        'on_time_count': on_time_count,
-        'overdue_count': overdue_count,
-        'avg_duration': round(avg_duration, 1),
+        'total_projects': summary['total_projects'],
+        'completed_count': summary['completed_count'],
+        'on_time_count': summary['on_time_count'],
+        'overdue_count': summary['overdue_count'],
+        'avg_duration': summary['avg_duration'],
         'completed_projects': completed_projects.order_by('-completed_at')[:10],
+        # Precomputed nightly by `forecast_projects`.
+        'at_risk_forecasts': ProjectForecast.objects.for_tenant(request.tenant).filter(
+            at_risk=True
+        ).select_related('project').order_by('-days_late', 'project__deadline')[:10],
+        # Jobs are written by the workers on the primary; don't read them
+        # from a possibly stale replica.
+        'report_jobs': ReportJob.objects.using(DEFAULT_DB_ALIAS).for_tenant(request.tenant).select_related('project')[:5],
+        'report_kinds': [choice for choice in ReportJob.KIND_CHOICES if choice[0] != 'TASKS'],
+        'report_formats': ReportJob.FORMAT_CHOICES,
         
         # Chart JSON data
-        'status_labels_json': json.dumps(status_labels),
-        'status_values_json': json.dumps(status_values),
-        'trend_labels_json': json.dumps(months),
-        'trend_values_json': json.dumps(completion_trends),
-        'performance_data_json': json.dumps([on_time_count, overdue_count]),
+        'status_labels_json': json.dumps(summary['status_labels']),
+        'status_values_json': json.dumps(summary['status_values']),
+        'trend_labels_json': json.dumps(summary['trend_labels']),
+        'trend_values_json': json.dumps(summary['trend_values']),
+        'performance_data_json': json.dumps([summary['on_time_count'], summary['overdue_count']]),
     }
     
     return render(request, 'reports/dashboard.html', context)
 
-@login_required
+@tenant_required
+@use_read_replica
 def export_projects_csv(request):
     response = HttpResponse(content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="completed_projects_report.csv"'
@@ -77,7 +55,7 @@ def export_projects_csv(request):
     writer = csv.writer(response)
     writer.writerow(['Project Name', 'Client', 'Start Date', 'Deadline', 'Completed At', 'Status', 'Progress'])
 
-    projects = Project.objects.filter(owner=request.user, status='COMPLETED').order_by('-completed_at')
+    projects = Project.objects.for_tenant(request.tenant).filter(status='COMPLETED').order_by('-completed_at')
     for p in projects:
         writer.writerow([
             p.name, 
@@ -90,3 +68,47 @@ def export_projects_csv(request):
         ])
 
     return response
+
+def _job_payload(job):
+    return {
+        'id': job.pk,
+        'status': job.status,
+        'error': job.error,
+        'status_url': reverse('report_job_status', kwargs={'pk': job.pk}),
+        'download_url': reverse('report_job_download', kwargs={'pk': job.pk}) if job.status == 'DONE' else None,
+    }
+
+@tenant_required
+@require_POST
+def generate_report(request):
+    """
+    Queues a PDF/Excel export. If the report was already generated for the
+    current data, the stored file is reused and the job is returned as done.
+    """
+    kind = request.POST.get('kind')
+    fmt = request.POST.get('format')
+    if kind not in dict(ReportJob.KIND_CHOICES) or fmt not in dict(ReportJob.FORMAT_CHOICES):
+        return JsonResponse({'error': 'Unknown report type.'}, status=400)
+    project = None
+    if kind == 'TASKS':
+        project = get_object_or_404(Project.objects.for_tenant(request.tenant), pk=request.POST.get('project'))
+
+    job = request_report(request.user, request.tenant, kind, fmt, project)
+    if request.headers.get('Accept') == 'application/json':
+        return JsonResponse(_job_payload(job))
+    if job.status == 'DONE':
+        return redirect('report_job_download', pk=job.pk)
+    messages.info(request, "Your report is being generated. It will appear under Recent Exports.")
+    return redirect('reports_dashboard')
+
+@tenant_required
+def report_job_status(request, pk):
+    job = get_object_or_404(ReportJob.objects.for_tenant(request.tenant), pk=pk)
+    return JsonResponse(_job_payload(job))
+
+@tenant_required
+def report_job_download(request, pk):
+    job = get_object_or_404(ReportJob.objects.for_tenant(request.tenant), pk=pk)
+    if not job.is_ready:
+        raise Http404("This report is not ready.")
+    return FileResponse(open(job.file_path, 'rb'), as_attachment=True, filename=job.filename)
@@ -0,0 +1,121 @@
+// Live updates: listens to the server-sent events feed and patches the page
+// in place. Elements opt in with data-live-project="<id>" plus
+// data-live-field="progress|progress-bar|status"; task tables use
+// data-live-tasks="<project id>" with rows marked data-live-task="<id>".
+(function () {
+    const script = document.currentScript;
+    if (!window.EventSource || !script || !script.dataset.eventsUrl) {
+        return;
+    }
+
+    const statusClasses = {
+        COMPLETED: 'bg-success',
+        IN_PROGRESS: 'bg-info',
+        ON_HOLD: 'bg-warning',
+    };
+    const taskStatusLabels = {
+        TODO: 'To Do',
+        IN_PROGRESS: 'In Progress',
+        DONE: 'Done',
+    };
+
+    function escapeHtml(value) {
+        const div = document.createElement('div');
+        div.textContent = value;
+        return div.innerHTML;
+    }
+
+    function formatDate(isoDate) {
+        if (!isoDate) {
+            return '-';
+        }
+        const date = new Date(isoDate + 'T00:00:00');
+        return date.toLocaleDateString('en-US', { month: 'short', day: '2-digit' });
+    }
+
+    function showNotice(html) {
+        const container = document.querySelector('.content-area');
+        if (!container) {
+            return;
+        }
+        const alert = document.createElement('div');
+        alert.className = 'alert alert-warning alert-dismissible fade show shadow-sm border-0 mb-4';
+        alert.setAttribute('role', 'alert');
+        alert.innerHTML = '<i class="fas fa-bell me-2"></i> ' + html +
+            '<button type="button" class="btn-close" data-bs-dismiss="alert"></button>';
+        container.prepend(alert);
+    }
+
+    function onProject(data) {
+        document.querySelectorAll('[data-live-project="' + data.id + '"]').forEach(function (el) {
+            switch (el.dataset.liveField) {
+                case 'progress':
+                    el.textContent = data.progress + '%';
+                    break;
+                case 'progress-bar':
+                    el.style.width = data.progress + '%';
+                    break;
+                case 'status':
+                    el.classList.remove('bg-success', 'bg-info', 'bg-warning', 'bg-secondary');
+                    el.classList.add(statusClasses[data.status] || 'bg-secondary');
+                    el.textContent = data.status_display;
+                    break;
+            }
+        });
+    }
+
+    function onTask(data) {
+        const table = document.querySelector('[data-live-tasks="' + data.project_id + '"]');
+        if (!table) {
+            return;
+        }
+        const row = table.querySelector('[data-live-task="' + data.id + '"]');
+        if (row) {
+            const select = row.querySelector('select[name="status"]');
+            if (select) {
+                select.value = data.status;
+            }
+            return;
+        }
+        if (!data.created) {
+            return;
+        }
+        const newRow = document.createElement('tr');
+        newRow.className = 'align-middle';
+        newRow.dataset.liveTask = data.id;
+        newRow.innerHTML =
+            '<td class="ps-4"><span class="fw-medium text-dark">' + escapeHtml(data.title) + '</span></td>' +
+            '<td><small class="text-muted">' + formatDate(data.due_date) + '</small></td>' +
+            '<td><small class="text-muted">-</small></td>' +
+            '<td><span class="badge bg-light text-dark border">' + (taskStatusLabels[data.status] || data.status) + '</span></td>' +
+            '<td class="text-end pe-4"></td>';
+        table.appendChild(newRow);
+    }
+
+    function onTaskDeleted(data) {
+        const row = document.querySelector('[data-live-tasks="' + data.project_id + '"] [data-live-task="' + data.id + '"]');
+        if (row) {
+            row.remove();
+        }
+    }
+
+    function onReminder(data) {
+        if (data.is_sent) {
+            showNotice('<strong>' + escapeHtml(data.project_name) + ':</strong> ' +
+                escapeHtml(data.message || 'Check project status'));
+        }
+    }
+
+    const source = new EventSource(script.dataset.eventsUrl);
+    const handlers = {
+        project: onProject,
+        task: onTask,
+        task_deleted: onTaskDeleted,
+        reminder: onReminder,
+    };
+    Object.keys(handlers).forEach(function (type) {
+        source.addEventListener(type, function (event) {
+            handlers[type](JSON.parse(event.data));
+        });
+    });
+})();
@@ -0,0 +1,54 @@
+// Background report exports: forms marked data-report-job are submitted with
+// fetch, then the job is polled until the file is ready and downloaded.
+// Without JavaScript the forms still post normally and the report shows up
+// under "Recent Exports" on the reports page.
+(function () {
+    const POLL_INTERVAL = 1500;
+
+    function setBusy(button, busy) {
+        if (!button.dataset.label) {
+            button.dataset.label = button.innerHTML;
+        }
+        button.disabled = busy;
+        button.innerHTML = busy
+            ? '<span class="spinner-border spinner-border-sm me-2"></span>Generating...'
+            : button.dataset.label;
+    }
+
+    function poll(job, button) {
+        if (job.status === 'DONE') {
+            setBusy(button, false);
+            window.location = job.download_url;
+            return;
+        }
+        if (job.status === 'FAILED') {
+            setBusy(button, false);
+            alert('Report generation failed: ' + (job.error || 'unknown error'));
+            return;
+        }
+        setTimeout(function () {
+            fetch(job.status_url, { headers: { 'Accept': 'application/json' } })
+                .then(function (response) { return response.json(); })
+                .then(function (next) { poll(next, button); })
+                .catch(function () { setBusy(button, false); });
+        }, POLL_INTERVAL);
+    }
+
+    document.querySelectorAll('form[data-report-job]').forEach(function (form) {
+        form.addEventListener('submit', function (event) {
+            event.preventDefault();
+            // The page-wide submit handler has already shown the loader.
+            document.getElementById('page-loader').classList.remove('show');
+            const button = form.querySelector('button[type="submit"]');
+            setBusy(button, true);
+            fetch(form.action, {
+                method: 'POST',
+                body: new FormData(form),
+                headers: { 'Accept': 'application/json' },
+            })
+                .then(function (response) { return response.json(); })
+                .then(function (job) { poll(job, button); })
+                .catch(function () { setBusy(button, false); });
+        });
+    });
+})();
@@ -0,0 +1,295 @@
+// Timeline: draws project bars and task due dates on a scrollable time axis.
+// Data comes from the timeline_data endpoint in fixed windows of CHUNK_DAYS,
+// fetched as the user scrolls; only the rows and ticks in view are in the DOM.
+(function () {
+    const script = document.currentScript;
+    const viewport = document.getElementById('timeline-viewport');
+    if (!script || !script.dataset.url || !viewport) {
+        return;
+    }
+
+    const ROW_HEIGHT = 32;
+    const LABEL_WIDTH = 220;
+    const HEADER_HEIGHT = 36;
+    const CHUNK_DAYS = 180;
+    const OVERSCAN_ROWS = 5;
+    const DAY_MS = 86400000;
+    const SCALES = { week: 12, month: 4, year: 1 };
+    const STATUS_COLORS = {
+        NOT_STARTED: '#94A3B8',
+        IN_PROGRESS: '#2563EB',
+        ON_HOLD: '#F59E0B',
+        COMPLETED: '#10B981',
+        CANCELLED: '#CBD5E1',
+    };
+
+    const canvas = document.getElementById('timeline-canvas');
+    const header = document.getElementById('timeline-header');
+    const labels = document.getElementById('timeline-labels');
+    const bars = document.getElementById('timeline-bars');
+    const empty = document.getElementById('timeline-empty');
+
+    const ticks = document.createElement('div');
+    header.appendChild(ticks);
+    const todayLine = document.createElement('div');
+    todayLine.className = 'timeline-today';
+    bars.appendChild(todayLine);
+
+    const now = new Date();
+    const today = Date.UTC(now.getFullYear(), now.getMonth(), now.getDate()) / DAY_MS;
+
+    const projects = new Map();
+    const loaded = new Set();
+    let statuses = [];
+    let scale = SCALES.month;
+    let origin = today - CHUNK_DAYS;
+    let last = today + CHUNK_DAYS;
+    let rows = [];
+    let labelPool = [];
+    let barPool = [];
+    let frame = null;
+
+    function isoDate(day) {
+        return new Date(day * DAY_MS).toISOString().slice(0, 10);
+    }
+
+    function dayToX(day) {
+        return (day - origin) * scale;
+    }
+
+    function visibleDays() {
+        const width = Math.max(0, viewport.clientWidth - LABEL_WIDTH);
+        const first = origin + Math.floor(viewport.scrollLeft / scale);
+        return [first, first + Math.ceil(width / scale)];
+    }
+
+    function merge(data) {
+        statuses = data.statuses;
+        const cols = data.projects;
+        for (let i = 0; i < cols.id.length; i++) {
+            const existing = projects.get(cols.id[i]);
+            const project = existing || { id: cols.id[i], tasks: [] };
+            project.name = cols.name[i];
+            project.start = cols.start[i];
+            project.end = cols.end[i];
+            project.status = statuses[cols.status[i]];
+            project.progress = cols.progress[i];
+            projects.set(project.id, project);
+        }
+        // Chunks never overlap, so each due date arrives exactly once.
+        const tasks = data.tasks;
+        for (let i = 0; i < tasks.project.length; i++) {
+            const project = projects.get(tasks.project[i]);
+            if (project) {
+                project.tasks.push([tasks.due[i], tasks.done[i] === 1]);
+            }
+        }
+    }
+
+    function load(chunk, withBounds) {
+        if (loaded.has(chunk)) {
+            return Promise.resolve(null);
+        }
+        loaded.add(chunk);
+        const start = chunk * CHUNK_DAYS;
+        let url = script.dataset.url + '?start=' + isoDate(start) + '&end=' + isoDate(start + CHUNK_DAYS - 1);
+        if (withBounds) {
+            url += '&bounds=1';
+        }
+        return fetch(url, { credentials: 'same-origin', headers: { Accept: 'application/json' } })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error('HTTP ' + response.status);
+                }
+                return response.json();
+            })
+            .then(function (data) {
+                merge(data);
+                schedule();
+                return data;
+            })
+            .catch(function () {
+                // Let the next scroll retry this chunk.
+                loaded.delete(chunk);
+                return null;
+            });
+    }
+
+    function loadVisible() {
+        const days = visibleDays();
+        const first = Math.floor(Math.max(origin, days[0] - CHUNK_DAYS) / CHUNK_DAYS);
+        const lastChunk = Math.floor(Math.min(last, days[1] + CHUNK_DAYS) / CHUNK_DAYS);
+        for (let chunk = first; chunk <= lastChunk; chunk++) {
+            load(chunk, false);
+        }
+    }
+
+    function schedule() {
+        if (frame === null) {
+            frame = requestAnimationFrame(render);
+        }
+    }
+
+    function pooled(pool, container, index, create) {
+        if (!pool[index]) {
+            pool[index] = create();
+            container.appendChild(pool[index]);
+        }
+        pool[index].style.display = '';
+        return pool[index];
+    }
+
+    function createLabel() {
+        const el = document.createElement('div');
+        el.className = 'timeline-label';
+        return el;
+    }
+
+    function createBar() {
+        const el = document.createElement('a');
+        el.className = 'timeline-bar';
+        el.innerHTML = '<div class="timeline-track"></div><div class="timeline-fill"></div><div></div>';
+        return el;
+    }
+
+    function renderTicks(days) {
+        const html = [];
+        const cursor = new Date(days[0] * DAY_MS);
+        if (scale === SCALES.week) {
+            // Mondays
+            cursor.setUTCDate(cursor.getUTCDate() - ((cursor.getUTCDay() + 6) % 7));
+        } else {
+            cursor.setUTCDate(1);
+            if (scale === SCALES.year) {
+                cursor.setUTCMonth(0);
+            }
+        }
+        while (cursor.getTime() / DAY_MS <= days[1]) {
+            const day = cursor.getTime() / DAY_MS;
+            let text;
+            if (scale === SCALES.week) {
+                text = cursor.toLocaleDateString('en-US', { month: 'short', day: '2-digit', timeZone: 'UTC' });
+                cursor.setUTCDate(cursor.getUTCDate() + 7);
+            } else if (scale === SCALES.month) {
+                text = cursor.toLocaleDateString('en-US', { month: 'short', year: 'numeric', timeZone: 'UTC' });
+                cursor.setUTCMonth(cursor.getUTCMonth() + 1);
+            } else {
+                text = String(cursor.getUTCFullYear());
+                cursor.setUTCFullYear(cursor.getUTCFullYear() + 1);
+            }
+            html.push('<div class="timeline-tick" style="left:' + (LABEL_WIDTH + dayToX(day)) + 'px">' + text + '</div>');
+        }
+        ticks.innerHTML = html.join('');
+    }
+
+    function render() {
+        frame = null;
+        const width = (last - origin + 1) * scale;
+        const days = visibleDays();
+
+        rows = [];
+        projects.forEach(function (project) {
+            if (project.start <= days[1] && project.end >= days[0]) {
+                rows.push(project);
+            }
+        });
+        rows.sort(function (a, b) {
+            return a.start - b.start || a.id - b.id;
+        });
+
+        const height = rows.length * ROW_HEIGHT;
+        canvas.style.width = (LABEL_WIDTH + width) + 'px';
+        canvas.style.height = (HEADER_HEIGHT + height) + 'px';
+        labels.style.height = height + 'px';
+        bars.style.width = width + 'px';
+        bars.style.height = height + 'px';
+
+        renderTicks(days);
+        todayLine.style.left = dayToX(today) + 'px';
+
+        const firstRow = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN_ROWS);
+        const lastRow = Math.min(rows.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN_ROWS);
+        let used = 0;
+        for (let index = firstRow; index < lastRow; index++, used++) {
+            const project = rows[index];
+            const top = index * ROW_HEIGHT + 'px';
+
+            const label = pooled(labelPool, labels, used, createLabel);
+            label.style.top = top;
+            label.textContent = project.name;
+            label.title = project.name;
+
+            const left = dayToX(project.start);
+            const barWidth = Math.max(scale, (project.end - project.start + 1) * scale);
+            const bar = pooled(barPool, bars, used, createBar);
+            bar.style.top = top;
+            bar.style.left = left + 'px';
+            bar.style.width = barWidth + 'px';
+            bar.href = script.dataset.projectUrl.replace('/0/', '/' + project.id + '/');
+            bar.title = project.name + ' (' + isoDate(project.start) + ' to ' + isoDate(project.end) + ', ' + project.progress + '%)';
+            bar.classList.toggle('is-overdue', project.end < today && project.status !== 'COMPLETED' && project.status !== 'CANCELLED');
+
+            const fill = bar.children[1];
+            fill.style.width = project.progress + '%';
+            fill.style.background = STATUS_COLORS[project.status] || STATUS_COLORS.NOT_STARTED;
+
+            bar.children[2].innerHTML = project.tasks.map(function (task) {
+                return '<span class="timeline-marker' + (task[1] ? ' is-done' : '') +
+                    '" style="left:' + (dayToX(task[0]) - left) + 'px"></span>';
+            }).join('');
+        }
+        for (let index = used; index < labelPool.length; index++) {
+            labelPool[index].style.display = 'none';
+            barPool[index].style.display = 'none';
+        }
+    }
+
+    function scrollToDay(day) {
+        const width = Math.max(0, viewport.clientWidth - LABEL_WIDTH);
+        viewport.scrollLeft = dayToX(day) - width / 2;
+    }
+
+    function setScale(name) {
+        const days = visibleDays();
+        const center = (days[0] + days[1]) / 2;
+        scale = SCALES[name];
+        document.querySelectorAll('[data-timeline-scale]').forEach(function (button) {
+            button.classList.toggle('active', button.dataset.timelineScale === name);
+        });
+        render();
+        scrollToDay(center);
+        loadVisible();
+    }
+
+    document.querySelectorAll('[data-timeline-scale]').forEach(function (button) {
+        button.addEventListener('click', function () {
+            setScale(button.dataset.timelineScale);
+        });
+    });
+    document.querySelectorAll('[data-timeline-today]').forEach(function (button) {
+        button.addEventListener('click', function () {
+            scrollToDay(today);
+        });
+    });
+    viewport.addEventListener('scroll', function () {
+        schedule();
+        loadVisible();
+    }, { passive: true });
+    window.addEventListener('resize', schedule);
+
+    load(Math.floor(today / CHUNK_DAYS), true).then(function (data) {
+        if (!data) {
+            return;
+        }
+        if (data.bounds[0] === null) {
+            viewport.classList.add('d-none');
+            empty.classList.remove('d-none');
+            return;
+        }
+        origin = Math.min(data.bounds[0], today - 90) - 30;
+        last = Math.max(data.bounds[1], today + 180) + 30;
+        render();
+        scrollToDay(today);
+        loadVisible();
+    });
+})();
@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import Organization, Membership
+
+class MembershipInline(admin.TabularInline):
+    model = Membership
+    extra = 1
+    autocomplete_fields = ('user',)
+
+@admin.register(Organization)
+class OrganizationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'created_at')
+    search_fields = ('name',)
+    inlines = [MembershipInline]
+
+@admin.register(Membership)
+class MembershipAdmin(admin.ModelAdmin):
+    list_display = ('user', 'organization', 'role', 'created_at')
+    list_filter = ('role', 'organization')
+    search_fields = ('user__username', 'organization__name')
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class TeamsConfig(AppConfig):
+    name = 'teams'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        # Keeps CachedModelBackend's user cache in sync with the auth tables.
+        from dpl_core import auth  # noqa: F401
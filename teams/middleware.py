@@ -0,0 +1,24 @@
+from .tenancy import get_memberships, resolve_membership
+
+
+class TenantMiddleware:
+    """
+    Sets request.memberships, request.membership and request.tenant (the
+    active Organization, or None). Resolved eagerly so async views can read
+    them without touching the database. Must come after
+    AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.memberships = []
+        request.membership = None
+        request.tenant = None
+        if request.user.is_authenticated:
+            request.memberships = get_memberships(request.user)
+            request.membership = resolve_membership(request, request.memberships)
+            if request.membership is not None:
+                request.tenant = request.membership.organization
+        return self.get_response(request)
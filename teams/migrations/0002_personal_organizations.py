@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-19 19:52
+
+from django.conf import settings
+from django.db import migrations
+
+
+def create_personal_organizations(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    Organization = apps.get_model('teams', 'Organization')
+    Membership = apps.get_model('teams', 'Membership')
+
+    for user in User.objects.filter(memberships__isnull=True).order_by('pk').iterator():
+        organization = Organization.objects.create(name=f"{user.username}'s workspace")
+        Membership.objects.create(organization=organization, user=user, role='OWNER')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_personal_organizations, migrations.RunPython.noop),
+    ]
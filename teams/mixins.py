@@ -0,0 +1,39 @@
+from functools import wraps
+
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import PermissionDenied
+
+
+def check_tenant(request, edit=False):
+    if request.tenant is None:
+        raise PermissionDenied("You are not a member of any organization.")
+    if edit and not request.membership.can_edit:
+        raise PermissionDenied("Your role in this organization is read-only.")
+
+
+class TenantRequiredMixin(LoginRequiredMixin):
+    """Requires an active organization; set tenant_edit to require write access."""
+    tenant_edit = False
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            check_tenant(request, edit=self.tenant_edit)
+        return super().dispatch(request, *args, **kwargs)
+
+
+class TenantEditRequiredMixin(TenantRequiredMixin):
+    tenant_edit = True
+
+
+def tenant_required(view_func=None, edit=False):
+    """Function-view counterpart of TenantRequiredMixin (implies login_required)."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            check_tenant(request, edit=edit)
+            return func(request, *args, **kwargs)
+        return login_required(wrapper)
+    if view_func is not None:
+        return decorator(view_func)
+    return decorator
@@ -0,0 +1,57 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+class Organization(models.Model):
+    """A tenant: projects, products and reports belong to an organization."""
+    name = models.CharField(max_length=255)
+    members = models.ManyToManyField(User, through='Membership', related_name='organizations')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def create_personal(cls, user):
+        organization = cls.objects.create(name=f"{user.username}'s workspace")
+        Membership.objects.create(organization=organization, user=user, role='OWNER')
+        return organization
+
+class Membership(models.Model):
+    ROLE_CHOICES = [
+        ('OWNER', 'Owner'),
+        ('ADMIN', 'Admin'),
+        ('MEMBER', 'Member'),
+        ('VIEWER', 'Viewer'),
+    ]
+    EDIT_ROLES = {'OWNER', 'ADMIN', 'MEMBER'}
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='memberships')
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='MEMBER')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['organization', 'user'], name='unique_membership'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} @ {self.organization.name} ({self.role})"
+
+    @property
+    def can_edit(self):
+        return self.role in self.EDIT_ROLES
+
+class TenantQuerySet(models.QuerySet):
+    def for_tenant(self, organization):
+        return self.filter(organization=organization)
+
+# Manager for tenant-owned models; views go through for_tenant() so every
+# query is led by the organization column and its composite indexes.
+TenantManager = models.Manager.from_queryset(TenantQuerySet)
@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Membership, Organization
+from .tenancy import invalidate_memberships
+
+
+@receiver(post_save, sender=User)
+def create_personal_organization(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Organization.create_personal(instance)
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def membership_changed(sender, instance, **kwargs):
+    invalidate_memberships(instance.user_id)
+
+
+@receiver(post_save, sender=Organization)
+def organization_changed(sender, instance, created, **kwargs):
+    if created:
+        return
+    # Cached memberships carry the organization (e.g. its name).
+    for user_id in instance.memberships.values_list('user_id', flat=True):
+        invalidate_memberships(user_id)
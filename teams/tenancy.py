@@ -0,0 +1,55 @@
+"""
+Resolves the active organization (tenant) for a request.
+
+A user's memberships are loaded once and kept in the default cache, so the
+tenant and the user's role in it are known without a query on warm requests.
+Authorization checks read request.membership instead of querying per object.
+The cached list is dropped whenever a membership or organization changes (see
+teams.signals).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Membership
+
+TENANT_SESSION_KEY = '_tenant_id'
+
+
+def memberships_cache_key(user_id):
+    return f"memberships:{user_id}"
+
+
+def invalidate_memberships(user_id):
+    cache.delete(memberships_cache_key(user_id))
+
+
+def get_memberships(user):
+    key = memberships_cache_key(user.pk)
+    memberships = cache.get(key)
+    if memberships is None:
+        memberships = list(
+            Membership.objects.filter(user=user).select_related('organization').order_by('created_at', 'pk')
+        )
+        cache.set(key, memberships, getattr(settings, 'MEMBERSHIP_CACHE_TIMEOUT', 300))
+    return memberships
+
+
+def resolve_membership(request, memberships):
+    """The session's chosen organization, falling back to the oldest membership."""
+    tenant_id = request.session.get(TENANT_SESSION_KEY)
+    for membership in memberships:
+        if membership.organization_id == tenant_id:
+            return membership
+    return memberships[0] if memberships else None
+
+
+def activate_tenant(request, organization_id):
+    """Switches the session to organization_id if the user belongs to it."""
+    for membership in getattr(request, 'memberships', ()):
+        if membership.organization_id == organization_id:
+            request.session[TENANT_SESSION_KEY] = organization_id
+            request.membership = membership
+            request.tenant = membership.organization
+            return True
+    return False
@@ -0,0 +1,25 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
+
+from .tenancy import activate_tenant
+
+
+@login_required
+@require_POST
+def switch_tenant(request):
+    try:
+        organization_id = int(request.POST.get('organization', ''))
+    except ValueError:
+        organization_id = None
+    if organization_id is None or not activate_tenant(request, organization_id):
+        messages.error(request, "You are not a member of that organization.")
+    else:
+        messages.success(request, f"Switched to {request.tenant.name}.")
+
+    next_url = request.POST.get('next')
+    if next_url and url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        return redirect(next_url)
+    return redirect('dashboard')